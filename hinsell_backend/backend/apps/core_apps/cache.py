@@ -0,0 +1,33 @@
+"""
+Generational cache revisions.
+
+Instead of deleting cached entries, writers bump a revision and readers
+build their keys from it, so stale entries are simply never read again and
+age out of the cache on their own.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _initial_revision():
+    return int(time.time() * 1000)
+
+
+def get_revision(key):
+    """Return the revision stored under ``key``, seeding it if missing."""
+    revision = cache.get(key)
+    if revision is None:
+        cache.add(key, _initial_revision(), timeout=None)
+        revision = cache.get(key)
+    return revision
+
+
+def bump_revision(key):
+    """Move ``key`` to a new revision and return it."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Seeding from the clock keeps a lost key from reusing an old revision.
+        cache.add(key, _initial_revision(), timeout=None)
+        return cache.get(key)
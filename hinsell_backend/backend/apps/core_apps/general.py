@@ -1,16 +1,20 @@
+import json
 import uuid
-from django.db import models
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections, models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from typing import Dict, List
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_api_key.permissions import HasAPIKey
 from rest_framework import viewsets
 from apps.core_apps.utils import Logger
+from apps.core_apps.middleware import get_current_user, set_current_user
 from apps.core_apps.mixins.code_generation_mixin import CodeGenerationMixin
 
 
@@ -21,6 +25,72 @@ class Pagination(PageNumberPagination):
     page_query_param = 'page'
 
 
+class KeysetPagination(CursorPagination):
+    """Seek pagination for large tables; subclasses or views set `ordering` to an indexed column."""
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin paginator that takes large result counts from the PostgreSQL planner.
+
+    COUNT(*) has to read every matching row; past `exact_count_threshold`
+    the planner's row estimate is used instead, which is close enough for
+    page links. Smaller results are still counted exactly.
+
+    An estimated count can be off either way. Pages past the estimate are
+    therefore served as plain slices instead of raising EmptyPage: when the
+    planner overestimates, the trailing page links show empty pages, and when
+    it underestimates, the remaining rows are still reachable on the pages
+    after the last link (by editing the page number in the URL).
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def estimated_count(self):
+        """The planner's row estimate, or None when the result is counted exactly."""
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet):
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                sql, params = queryset.order_by().query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                    plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = int(plan[0]['Plan']['Plan Rows'])
+                if estimate >= self.exact_count_threshold:
+                    return estimate
+        return None
+
+    @cached_property
+    def count(self):
+        if self.estimated_count is not None:
+            return self.estimated_count
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Beyond an estimated last page there may still be rows; let page() slice it.
+            if self.estimated_count is None or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.estimated_count is None:
+            return super().page(number)
+        # Slice a full page without clamping to the estimate, so no row is cut off.
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
 class TimestampedModelManager(models.Manager):
     def get_queryset(self):
         """Return only non-deleted records by default."""
@@ -146,6 +216,12 @@ class AuditableModel(CodeGenerationMixin,TimestampedModel):
             self.created_at = timezone.now()
         self.updated_at = timezone.now()
 
+        user = get_current_user()
+        if user is not None:
+            if self._state.adding and self.created_by_id is None:
+                self.created_by = user
+            self.updated_by = user
+
         super().save(*args, **kwargs)
     
     def delete(self, *args, **kwargs):
@@ -168,20 +244,38 @@ class BaseViewSet(viewsets.ModelViewSet):
     ordering: List[str] = ['-created_at']
 
     def get_queryset(self) -> QuerySet:
-        """Return the full queryset without filtering by branch or user."""
-        return self.queryset
+        """Return the full queryset without filtering by branch or user, eager-loading what the serializer reads."""
+        queryset = self.queryset
+        setup_eager_loading = getattr(self.get_serializer_class(), 'setup_eager_loading', None)
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset)
+        return queryset
+
+    def __init_subclass__(cls, **kwargs):
+        """Instantiate each view's permission classes once, keyed by action."""
+        super().__init_subclass__(**kwargs)
+        # Permission classes are stateless, so one instance per view class can serve every request.
+        cls._default_permissions = tuple(permission() for permission in cls.permission_classes)
+        cls._permissions_by_action = {
+            action: tuple(permission() for permission in classes)
+            for action, classes in cls.permission_classes_by_action.items()
+        }
+
+    def initial(self, request, *args, **kwargs):
+        """Expose the DRF-authenticated user (JWT, API key) to AuditableModel.save."""
+        super().initial(request, *args, **kwargs)
+        # Django's middleware only sees session users; token auth happens here.
+        set_current_user(request.user)
 
     def get_permissions(self):
         """Return permission classes based on action."""
-        try:
-            return [
-                permission()
-                for permission in self.permission_classes_by_action.get(
-                    self.action, self.permission_classes
-                )
-            ]
-        except AttributeError:
-            return [permission() for permission in self.permission_classes]
+        permissions = self._permissions_by_action.get(getattr(self, 'action', None))
+        if permissions is None:
+            if 'permission_classes' in self.__dict__:
+                # Set per view by `@action(permission_classes=...)`.
+                return [permission() for permission in self.permission_classes]
+            permissions = self._default_permissions
+        return list(permissions)
 
     def perform_create(self, serializer):
         """Set created_by and updated_by fields on create."""
@@ -0,0 +1,90 @@
+"""
+Batched Algolia reindexing for models registered with algoliasearch_django.
+
+Signal receivers call `queue_reindex`; the ids are synced by
+`update_algolia_index_bulk` after the writing transaction commits.
+"""
+import threading
+
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.dispatch import receiver
+
+from apps.core_apps.search import auto_indexing_enabled
+from apps.core_apps.tasks import update_algolia_index_bulk
+
+# Per-thread (app_label, model_name) -> {pk} waiting for the next Algolia sync.
+_pending = threading.local()
+
+
+def _pending_reindex():
+    if not hasattr(_pending, 'ids'):
+        _pending.ids = {}
+    return _pending.ids
+
+
+class _TransactionReindexBatch:
+    """Ids saved inside one transaction, handed on once it commits."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __call__(self):
+        _collect_reindex(self.ids)
+
+
+def _collect_reindex(ids):
+    """
+    Take committed ids for the next bulk Algolia sync.
+
+    Inside a request they are merged and flushed once when the request
+    finishes; elsewhere (Celery workers, management commands) they are sent
+    straight away.
+    """
+    if getattr(_pending, 'in_request', False):
+        pending = _pending_reindex()
+        for key, pks in ids.items():
+            pending.setdefault(key, set()).update(pks)
+    else:
+        _send_reindex(ids)
+
+
+def queue_reindex(instance, using):
+    """Record an instance for reindexing once its transaction commits, at most once per transaction."""
+    if not auto_indexing_enabled():
+        return
+    key = (instance._meta.app_label, instance.__class__.__name__)
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        _collect_reindex({key: {str(instance.pk)}})
+        return
+
+    # A batch whose callback is no longer queued belongs to a transaction that
+    # already committed or rolled back, so start a fresh one.
+    batch = getattr(connection, 'algolia_reindex_batch', None)
+    if batch is None or not any(entry[1] is batch for entry in connection.run_on_commit):
+        batch = connection.algolia_reindex_batch = _TransactionReindexBatch()
+        transaction.on_commit(batch, using=using)
+    batch.ids.setdefault(key, set()).add(str(instance.pk))
+
+
+def _send_reindex(ids):
+    for (app_label, model_name), pks in ids.items():
+        update_algolia_index_bulk.delay(app_label, model_name, list(pks))
+
+
+def _flush_reindex():
+    pending = _pending_reindex()
+    _pending.ids = {}
+    _send_reindex(pending)
+
+
+@receiver(request_started)
+def start_reindex_batch(sender, **kwargs):
+    _pending.in_request = True
+
+
+@receiver(request_finished)
+def flush_reindex_batch(sender, **kwargs):
+    _pending.in_request = False
+    _flush_reindex()
@@ -0,0 +1,134 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from algoliasearch.search.client import SearchClientSync
+from algoliasearch.search.models.operation_index_params import OperationIndexParams
+from algoliasearch.search.models.operation_type import OperationType
+from algoliasearch.search.models.scope_type import ScopeType
+from algoliasearch_django import algolia_engine, get_adapter, get_registered_model
+from algoliasearch_django.settings import SETTINGS as ALGOLIA_SETTINGS
+from apps.core_apps.utils import Logger
+
+logger = Logger(__name__)
+
+_worker_client = None
+
+
+def _init_worker():
+    """Give every worker process its own DB connection and Algolia client."""
+    global _worker_client
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+    _worker_client = SearchClientSync(ALGOLIA_SETTINGS['APPLICATION_ID'], ALGOLIA_SETTINGS['API_KEY'])
+
+
+def _index_chunk(task):
+    """
+    Fetch, serialize and push one chunk of primary keys.
+
+    Returns the number of records sent and the Algolia task ids to wait on;
+    the worker moves on to its next chunk instead of waiting for indexing.
+    """
+    model_label, index_name, pks, batch_size = task
+    model = apps.get_model(model_label)
+    adapter = get_adapter(model)
+    if callable(getattr(adapter, 'get_queryset', None)):
+        queryset = adapter.get_queryset()
+    else:
+        queryset = model.objects.all()
+
+    records = [
+        adapter.get_raw_record(instance)
+        for instance in queryset.filter(pk__in=pks)
+        if adapter._should_index(instance)
+    ]
+    task_ids = []
+    if records:
+        responses = _worker_client.save_objects(
+            index_name=index_name,
+            objects=records,
+            batch_size=batch_size,
+        )
+        task_ids = [response.task_id for response in responses]
+    return len(records), task_ids
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Algolia indices, serializing records across a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', nargs='+', type=str, help='Only reindex these model names')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+        parser.add_argument('--chunksize', type=int, default=500, help='Primary keys handed to a worker at a time')
+        parser.add_argument('--batchsize', type=int, default=1000, help='Records per Algolia batch request')
+
+    def handle(self, *args, **options):
+        models = [
+            model for model in get_registered_model()
+            if not options['model'] or model.__name__ in options['model']
+        ]
+        if not models:
+            raise CommandError('No registered Algolia models matched.')
+
+        self.stdout.write('The following models were reindexed:')
+        for model in models:
+            counts = self.reindex_model(model, options)
+            self.stdout.write(f'\t* {model.__name__} --> {counts}')
+        self.stdout.write(self.style.SUCCESS('Parallel reindex completed.'))
+
+    def reindex_model(self, model, options):
+        """Fill the temporary index in parallel, then atomically move it over the live one."""
+        adapter = get_adapter(model)
+        client = algolia_engine.client
+        chunksize = options['chunksize']
+
+        response = client.clear_objects(adapter.tmp_index_name)
+        client.wait_for_task(adapter.tmp_index_name, response.task_id)
+        if client.index_exists(adapter.index_name):
+            response = client.operation_index(
+                adapter.index_name,
+                OperationIndexParams(
+                    operation=OperationType.COPY,
+                    destination=adapter.tmp_index_name,
+                    scope=[ScopeType.SETTINGS, ScopeType.SYNONYMS, ScopeType.RULES],
+                ),
+            )
+            client.wait_for_task(adapter.index_name, response.task_id)
+        if adapter.settings:
+            response = client.set_settings(adapter.tmp_index_name, adapter.settings)
+            client.wait_for_task(adapter.tmp_index_name, response.task_id)
+
+        pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+        tasks = [
+            (model._meta.label, adapter.tmp_index_name, pks[start:start + chunksize], options['batchsize'])
+            for start in range(0, len(pks), chunksize)
+        ]
+
+        # Forked workers must not share the parent's database socket.
+        connections.close_all()
+        counts = 0
+        task_ids = []
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as executor:
+            for count, chunk_task_ids in executor.map(_index_chunk, tasks):
+                counts += count
+                task_ids.extend(chunk_task_ids)
+
+        # Every batch must be indexed before the temporary index replaces the live one.
+        for task_id in task_ids:
+            client.wait_for_task(adapter.tmp_index_name, task_id)
+
+        response = client.operation_index(
+            adapter.tmp_index_name,
+            OperationIndexParams(operation=OperationType.MOVE, destination=adapter.index_name),
+        )
+        client.wait_for_task(adapter.tmp_index_name, response.task_id)
+        logger.info(
+            f"Parallel reindex of {model.__name__} completed",
+            extra={'index': adapter.index_name, 'records': counts, 'chunks': len(tasks)}
+        )
+        return counts
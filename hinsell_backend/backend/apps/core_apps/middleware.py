@@ -0,0 +1,29 @@
+from contextvars import ContextVar
+
+_current_user = ContextVar('current_user', default=None)
+
+
+def get_current_user():
+    """Return the authenticated user of the request being handled, or None outside a request."""
+    user = _current_user.get()
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+def set_current_user(user):
+    """Replace the user for the rest of the request, e.g. once DRF has authenticated it."""
+    _current_user.set(user)
+
+
+class CurrentUserMiddleware:
+    """Expose request.user to model saves so AuditableModel can stamp created_by/updated_by."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_user.set(getattr(request, 'user', None))
+        try:
+            return self.get_response(request)
+        finally:
+            _current_user.reset(token)
@@ -0,0 +1,84 @@
+"""
+Shared helpers for the Algolia search indices.
+"""
+import datetime
+import uuid
+from decimal import Decimal
+
+from algoliasearch.search import client as algolia_search_client
+from algoliasearch_django.settings import SETTINGS as ALGOLIA_SETTINGS
+from django.db.models import Model
+
+PRIMITIVE_TYPES = (str, bool, int, float, bytes)
+
+
+def _serialize_dict(obj):
+    return {key: serialize_value(value) for key, value in obj.items()}
+
+
+def _serialize_sequence(obj):
+    return [serialize_value(value) for value in obj]
+
+
+def _serialize_temporal(obj):
+    return obj.isoformat()
+
+
+# Exact-type dispatch covers nearly every value in a record with one dict lookup.
+_SERIALIZERS = {
+    **{primitive: None for primitive in PRIMITIVE_TYPES},
+    type(None): None,
+    dict: _serialize_dict,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+    Decimal: float,
+    uuid.UUID: str,
+    datetime.datetime: _serialize_temporal,
+    datetime.date: _serialize_temporal,
+    datetime.time: _serialize_temporal,
+}
+
+
+def serialize_value(obj, _serializers=_SERIALIZERS, _type=type):
+    """
+    Convert a raw Algolia record into JSON-ready values in a single walk.
+
+    Handles everything the stock body serializer does, plus UUIDs, model
+    instances (sent as their primary key) and date/time values, so index
+    classes can return their raw records untouched. The underscored defaults
+    only bind the dispatch table and type() as locals for the hot path.
+    """
+    try:
+        serializer = _serializers[_type(obj)]
+    except KeyError:
+        pass
+    else:
+        return obj if serializer is None else serializer(obj)
+
+    # Subclasses (OrderedDict, ReturnDict, ...) and everything else.
+    if isinstance(obj, PRIMITIVE_TYPES):
+        return obj
+    if isinstance(obj, dict):
+        return _serialize_dict(obj)
+    if isinstance(obj, (list, tuple)):
+        return _serialize_sequence(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Model):
+        pk = obj.pk
+        return str(pk) if isinstance(pk, uuid.UUID) else pk
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    return serialize_value(obj.to_dict())
+
+
+def auto_indexing_enabled():
+    """Whether model writes should be pushed to Algolia (``ALGOLIA['AUTO_INDEXING']``)."""
+    return ALGOLIA_SETTINGS.get('AUTO_INDEXING', True)
+
+
+# The search client resolves `body_serializer` from its module globals on every
+# request, so swapping it here covers every index without touching the records.
+algolia_search_client.body_serializer = serialize_value
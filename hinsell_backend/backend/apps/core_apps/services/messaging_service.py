@@ -147,6 +147,44 @@ class MessagingService:
             logger.error(f"Error sending notification {notification_type}/{channel}: {str(e)}", exc_info=True)
             raise
 
+    def send_notification_bulk(self, recipients: List[User], notification_type: str,
+                               context_data: Dict, channel: str, priority: str = 'normal') -> List[Notification]:
+        """Send the same notification to many users, rendering the template and inserting rows once per batch."""
+        if channel not in NotificationTemplate.Channel.values:
+            logger.error(f"Invalid channel: {channel}")
+            raise ValueError(f"Invalid channel: {channel}")
+
+        template = self._get_template(notification_type, channel)
+        if not template:
+            logger.error(f"No template found for {notification_type}/{channel}")
+            raise ValueError(f"No template found for {notification_type}/{channel}")
+
+        try:
+            rendered = template.render(context_data)
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    branch=self.branch,
+                    template=template,
+                    recipient=recipient,
+                    channel=channel,
+                    notification_type=notification_type,
+                    priority=priority,
+                    subject=rendered['subject'],
+                    content=rendered['content'],
+                    html_content=rendered['html_content'],
+                    context_data=context_data,
+                    max_retries=self.settings['max_retries']
+                )
+                for recipient in recipients
+                if self._validate_recipient(recipient, channel)
+            ])
+            for notification in notifications:
+                self._dispatch_notification(notification)
+            return notifications
+        except Exception as e:
+            logger.error(f"Error sending bulk notification {notification_type}/{channel}: {str(e)}", exc_info=True)
+            raise
+
     def _dispatch_notification(self, notification: Notification) -> None:
         """Dispatch notification to the appropriate channel handler."""
         channel = notification.channel
@@ -0,0 +1,58 @@
+from celery import shared_task
+from django.apps import apps
+from algoliasearch_django import algolia_engine, get_adapter
+from apps.core_apps.search import auto_indexing_enabled
+from apps.core_apps.utils import Logger
+
+logger = Logger(__name__)
+
+ALGOLIA_BATCH_SIZE = 1000
+
+
+@shared_task
+def update_algolia_index_bulk(app_label, model_name, pks):
+    """
+    Sync a batch of records with their Algolia index.
+
+    Rows that still exist and pass `should_index` are saved, everything else
+    (deleted, soft-deleted or filtered out) is removed, so the same task covers
+    saves and deletes.
+    """
+    if not auto_indexing_enabled():
+        return 0
+    model = apps.get_model(app_label, model_name)
+    if not algolia_engine.is_registered(model):
+        return 0
+    adapter = get_adapter(model)
+    if callable(getattr(adapter, 'get_queryset', None)):
+        queryset = adapter.get_queryset()
+    else:
+        queryset = model.objects.all()
+
+    records = []
+    removed = {str(pk) for pk in pks}
+    for instance in queryset.filter(pk__in=pks):
+        if adapter._should_index(instance):
+            records.append(adapter.get_raw_record(instance))
+            removed.discard(str(instance.pk))
+
+    try:
+        if records:
+            algolia_engine.client.save_objects(
+                index_name=adapter.index_name,
+                objects=records,
+                batch_size=ALGOLIA_BATCH_SIZE
+            )
+        if removed:
+            algolia_engine.client.delete_objects(
+                index_name=adapter.index_name,
+                object_ids=list(removed),
+                batch_size=ALGOLIA_BATCH_SIZE
+            )
+    except Exception as e:
+        logger.error(f"Error syncing {model_name} records with Algolia: {str(e)}",
+                     extra={'app_label': app_label, 'records': len(pks)}, exc_info=True)
+        return 0
+
+    logger.info(f"Synced {len(records)} {model_name} records with Algolia, removed {len(removed)}")
+    return len(records) + len(removed)
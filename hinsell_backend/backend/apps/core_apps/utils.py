@@ -1,4 +1,5 @@
 import uuid
+from decimal import Decimal, ROUND_HALF_UP
 from django.utils.text import slugify
 import logging
 from typing import Optional, Dict, Any
@@ -21,6 +22,18 @@ def generate_unique_slug(name: str, model_class, max_length: int = 120) -> str:
         counter += 1
     return slug[:max_length]
 
+AMOUNT_SCALE = 10000  # Amount fields carry four decimal places.
+
+def to_scaled_int(value) -> int:
+    """Convert an amount into an integer count of ten-thousandths for fast arithmetic."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * AMOUNT_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+def from_scaled_int(units: int) -> Decimal:
+    """Convert ten-thousandths back into a Decimal amount."""
+    return Decimal(units).scaleb(-4)
+
 
 class Logger:
     """Custom logger for structured logging with context."""
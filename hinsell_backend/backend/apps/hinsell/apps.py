@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HinsellConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.hinsell'
+
+    def ready(self):
+        import apps.hinsell.signals  # noqa: F401
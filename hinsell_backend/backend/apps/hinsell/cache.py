@@ -0,0 +1,83 @@
+"""
+Generational cache keys for offer data and promotion lists, plus the
+Redis counters behind campaign tracking.
+"""
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from apps.core_apps.cache import bump_revision, get_revision
+
+OFFERS_REVISION_KEY = 'offers_rev_{branch_id}'
+LIST_REVISION_KEY = 'hinsell_list_rev_{model_name}'
+
+
+def get_offers_revision(branch_id):
+    """Return the current offer revision for a branch, seeding it if missing."""
+    return get_revision(OFFERS_REVISION_KEY.format(branch_id=branch_id))
+
+
+def bump_offers_revision(branch_id):
+    """Invalidate every cached offer entry of a branch."""
+    return bump_revision(OFFERS_REVISION_KEY.format(branch_id=branch_id))
+
+
+def active_offers_cache_key(branch_id):
+    """Cache key for the active offers of a branch at its current revision."""
+    return f"active_offers_{branch_id}_v{get_offers_revision(branch_id)}"
+
+
+def get_list_revision(model_name):
+    """Return the revision of a promotion model's list responses."""
+    return get_revision(LIST_REVISION_KEY.format(model_name=model_name))
+
+
+def bump_list_revision(model_name):
+    """Mark every list response of a promotion model as changed."""
+    return bump_revision(LIST_REVISION_KEY.format(model_name=model_name))
+
+
+CAMPAIGN_COUNTER_FIELDS = ('impressions', 'clicks', 'conversions')
+CAMPAIGN_COUNTER_KEY = 'camp:{campaign_id}:{field}'
+CAMPAIGN_TRACKABLE_KEY = 'camp_trackable:{campaign_id}'
+CAMPAIGN_TRACKABLE_TIMEOUT = 60
+
+
+def campaign_is_trackable(campaign_id, check):
+    """Return the cached result of ``check()`` (does the campaign exist?) for a short while."""
+    return cache.get_or_set(
+        CAMPAIGN_TRACKABLE_KEY.format(campaign_id=campaign_id), check, CAMPAIGN_TRACKABLE_TIMEOUT
+    )
+
+
+def forget_campaign_trackable(campaign_id):
+    """Drop the cached liveness of a campaign after it was saved or deleted."""
+    cache.delete(CAMPAIGN_TRACKABLE_KEY.format(campaign_id=campaign_id))
+
+
+def incr_campaign_counter(campaign_id, field, delta=1):
+    """Count campaign events in the cache; `flush_campaign_counters` moves them to the database."""
+    key = CAMPAIGN_COUNTER_KEY.format(campaign_id=campaign_id, field=field)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout=None):
+            return delta
+        return cache.incr(key, delta)
+
+
+def pop_campaign_counters():
+    """
+    Drain the pending campaign counters into {campaign_id: {field: delta}}.
+
+    Each counter is read and removed with one GETDEL, so events counted while
+    the flush runs start a fresh key for the next one and drained keys do not
+    accumulate.
+    """
+    client = get_redis_connection('default')
+    pending = {}
+    for key in cache.iter_keys(CAMPAIGN_COUNTER_KEY.format(campaign_id='*', field='*')):
+        _, campaign_id, field = key.split(':')
+        delta = int(client.getdel(cache.make_key(key)) or 0)
+        if delta > 0 and field in CAMPAIGN_COUNTER_FIELDS:
+            pending.setdefault(campaign_id, {})[field] = delta
+    return pending
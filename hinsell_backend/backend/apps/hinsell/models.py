@@ -1,24 +1,165 @@
 import logging
 from datetime import datetime
+from functools import partial
 from decimal import Decimal
-from typing import Dict, List, Optional
-from django.db import models
+from typing import Dict, List, Optional, Tuple
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, F, Prefetch, Q, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
-from apps.core_apps.general import AuditableModel
+from apps.core_apps.general import AuditableModel, TimestampedModelManager
 from apps.core_apps.validators import validate_percentage
-from apps.core_apps.utils import generate_unique_code, generate_unique_slug, Logger
+from apps.core_apps.utils import generate_unique_code, generate_unique_slug, Logger, to_scaled_int, from_scaled_int
 from apps.authentication.models import User
 from apps.organization.models import Branch
 from apps.inventory.models import Item, ItemGroup, StoreGroup, Media
-from apps.core_apps.services.messaging_service import MessagingService
+from apps.hinsell.cache import bump_list_revision
+from apps.hinsell.pricing import apply_bxgy, apply_discount
 from apps.transactions.models import TransactionHeader
 from django.db.utils import IntegrityError
 
 logger = logging.getLogger(__name__)
 
+
+def _related_ids(instance, relation: str) -> frozenset:
+    """Return the primary keys of a many-to-many relation, computed once per instance.
+
+    Id-only rows prefetched into ``_prefetched_<relation>`` (see
+    ``OfferQuerySet.with_targets``) or a regular prefetch are reused when
+    present; otherwise a single ``values_list`` query is issued instead of
+    one ``exists()`` round-trip per check.
+    """
+    cache = instance.__dict__.setdefault('_related_ids_cache', {})
+    if relation not in cache:
+        prefetched = instance.__dict__.get(f'_prefetched_{relation}')
+        manager = getattr(instance, relation)
+        if prefetched is not None:
+            cache[relation] = frozenset(obj.pk for obj in prefetched)
+        elif relation in getattr(instance, '_prefetched_objects_cache', {}):
+            cache[relation] = frozenset(obj.pk for obj in manager.all())
+        else:
+            cache[relation] = frozenset(manager.values_list('pk', flat=True))
+    return cache[relation]
+
+
+class OfferQuerySet(models.QuerySet):
+    def with_targets(self):
+        """Prefetch the ids of the target relations consulted by ``Offer.is_valid``.
+
+        Only primary keys are fetched and they go to ``_prefetched_<relation>``
+        attributes, so ``offer.target_users.all()`` elsewhere still returns
+        fully loaded rows instead of deferred ones.
+        """
+        return self.prefetch_related(
+            Prefetch('target_users', queryset=User.objects.only('id'), to_attr='_prefetched_target_users'),
+            Prefetch('target_items', queryset=Item.objects.select_related(None).only('id'), to_attr='_prefetched_target_items'),
+            Prefetch('target_item_groups', queryset=ItemGroup.objects.only('id'), to_attr='_prefetched_target_item_groups'),
+            Prefetch('target_store_groups', queryset=StoreGroup.objects.only('id'), to_attr='_prefetched_target_store_groups'),
+        )
+
+    def active_for_context(self, now: Optional[datetime] = None, country: Optional[str] = None):
+        """Offers running at ``now`` with their targets prefetched for ``is_valid``.
+
+        When ``country`` is given, country-targeted offers for other countries
+        are excluded in SQL using the GIN index on ``target_countries``.
+        """
+        now = now or timezone.now()
+        queryset = self.filter(is_active=True, start_date__lte=now, end_date__gte=now)
+        if country:
+            queryset = queryset.filter(
+                ~Q(target_type=Offer.TargetType.COUNTRY) | Q(target_countries__contains=[country])
+            )
+        return queryset.order_by('end_date').with_targets()
+
+
+class OfferManager(TimestampedModelManager.from_queryset(OfferQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().select_related('branch')
+
+
+class CouponManager(TimestampedModelManager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('branch')
+
+
+class CampaignManager(TimestampedModelManager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('branch', 'offer', 'coupon')
+
+    def add_tracking_counts(self, pk, impressions: int = 0, clicks: int = 0, conversions: int = 0) -> int:
+        """Add tracked events to a campaign and refresh its conversion rate in a single UPDATE."""
+        updated = self.get_queryset().filter(pk=pk).update(
+            impressions=F('impressions') + impressions,
+            clicks=F('clicks') + clicks,
+            conversions=F('conversions') + conversions,
+            conversion_rate=_conversion_rate(F('impressions') + impressions, F('conversions') + conversions)
+        )
+        if updated:
+            transaction.on_commit(partial(bump_list_revision, 'Campaign'))
+        return updated
+
+
+def _consume_use(model, pk, count: int = 1) -> bool:
+    """Atomically take ``count`` uses of an offer/coupon, honouring ``max_uses``; False when not enough are left."""
+    updated = model.objects.filter(pk=pk, is_active=True).filter(
+        Q(max_uses=0) | Q(current_uses__lte=F('max_uses') - count)
+    ).update(current_uses=F('current_uses') + count)
+    if updated:
+        transaction.on_commit(partial(bump_list_revision, model.__name__))
+    return updated > 0
+
+
+def _conversion_rate(impressions, conversions):
+    """SQL counterpart of ``Campaign.update_conversion_rate`` for use inside ``update()``."""
+    rate_field = DecimalField(max_digits=5, decimal_places=2)
+    return Case(
+        When(
+            GreaterThan(impressions, 0),
+            then=Cast(Cast(conversions, DecimalField(max_digits=15, decimal_places=4)) * 100 / impressions, rate_field),
+        ),
+        default=Value(Decimal('0.00')),
+        output_field=rate_field,
+    )
+
+
+RECIPIENT_CHUNK_SIZE = 500
+NOTIFICATION_BATCH_SIZE = 100
+
+
+def _queue_notifications(promotion, users: Optional[List[User]], queryset, channel: str) -> int:
+    """Fan notifications for ``promotion`` out to Celery in batches of user ids; returns how many users were queued."""
+    from celery import group
+    from apps.hinsell.tasks import send_promotion_notifications
+
+    if users:
+        user_ids = (user.id for user in users)
+    else:
+        user_ids = queryset.values_list('id', flat=True).iterator(chunk_size=RECIPIENT_CHUNK_SIZE)
+
+    batches = []
+    batch = []
+    for user_id in user_ids:
+        batch.append(str(user_id))
+        if len(batch) >= NOTIFICATION_BATCH_SIZE:
+            batches.append(batch)
+            batch = []
+    if batch:
+        batches.append(batch)
+
+    if batches:
+        group(
+            send_promotion_notifications.s(promotion._meta.model_name, str(promotion.pk), batch, channel)
+            for batch in batches
+        ).apply_async()
+    return sum(len(batch) for batch in batches)
+
+
 class Offer(AuditableModel):
     """Model for managing promotional offers with flexible targeting."""
     class OfferType(models.TextChoices):
@@ -76,7 +217,8 @@ class Offer(AuditableModel):
         related_name='offers',
         verbose_name=_("Target Users")
     )
-    target_countries = models.JSONField(
+    target_countries = ArrayField(
+        models.CharField(max_length=2),
         default=list,
         blank=True,
         verbose_name=_("Target Countries"),
@@ -172,6 +314,8 @@ class Offer(AuditableModel):
         verbose_name=_("Meta Description")
     )
 
+    objects = OfferManager()
+
     class Meta:
         verbose_name = _("Offer")
         verbose_name_plural = _("Offers")
@@ -179,6 +323,8 @@ class Offer(AuditableModel):
             models.Index(fields=['branch', 'code']),
             models.Index(fields=['slug', 'is_active', 'start_date', 'end_date']),
             models.Index(fields=['offer_type', 'target_type']),
+            GinIndex(fields=['target_countries'], name='offer_target_countries_gin'),
+            models.Index(fields=['branch', 'end_date'], condition=Q(is_active=True), name='offer_active_partial'),
         ]
         constraints = [
             models.CheckConstraint(
@@ -230,78 +376,147 @@ class Offer(AuditableModel):
                 # Log the issue but don't raise an exception that breaks admin
                 logger.warning(f"Offer {self.code} has no targets specified for target type {self.target_type}")
 
-    def is_valid(self, user: Optional[User] = None, country: Optional[str] = None, item: Optional[Item] = None) -> bool:
-        """Check if the offer is valid for the given context."""
-        now = timezone.now()
+    def is_valid(self, user: Optional[User] = None, country: Optional[str] = None, item: Optional[Item] = None,
+                 now: Optional[datetime] = None) -> bool:
+        """Check if the offer is valid for the given context.
+
+        Callers validating many offers should take ``now`` once and pass it down.
+        """
+        now = now or timezone.now()
         if not self.is_active or now < self.start_date or now > self.end_date:
             return False
         if self.max_uses > 0 and self.current_uses >= self.max_uses:
             return False
-        if self.target_type == self.TargetType.USER and user and not self.target_users.filter(id=user.id).exists():
-            return False
-        if self.target_type == self.TargetType.COUNTRY and country and country not in self.target_countries:
-            return False
-        if self.target_type == self.TargetType.ITEM and item and not self.target_items.filter(id=item.id).exists():
-            return False
-        if self.target_type == self.TargetType.ITEM_GROUP and item and not self.target_item_groups.filter(id=item.item_group.id).exists():
-            return False
-        if self.target_type == self.TargetType.STORE_GROUP and item and not self.target_store_groups.filter(id=item.item_group.store_group.id).exists():
-            return False
-        return True
-
-    def apply(self, price: Decimal, quantity: int = 1, user: Optional[User] = None) -> Dict:
+        return self._matches_target(user, country, item)
+
+    @property
+    def _target_country_set(self) -> frozenset:
+        """``target_countries`` as a frozenset, rebuilt only when the list is reassigned."""
+        cached = self.__dict__.get('_target_country_cache')
+        if cached is None or cached[0] is not self.target_countries:
+            cached = (self.target_countries, frozenset(self.target_countries))
+            self.__dict__['_target_country_cache'] = cached
+        return cached[1]
+
+    def _matches_target(self, user: Optional[User], country: Optional[str], item: Optional[Item]) -> bool:
+        """Targeting part of ``is_valid``, memoised per (user, country, item) for the life of the instance.
+
+        Pricing a cart validates the same offer against many lines. The date and
+        usage checks stay outside the memo because they change over time.
+        """
+        key = (user.id if user else None, country, item.id if item else None)
+        cache = self.__dict__.setdefault('_target_match_cache', {})
+        if key not in cache:
+            cache[key] = not (
+                (self.target_type == self.TargetType.USER and user and user.id not in _related_ids(self, 'target_users'))
+                or (self.target_type == self.TargetType.COUNTRY and country and country not in self._target_country_set)
+                or (self.target_type == self.TargetType.ITEM and item and item.id not in _related_ids(self, 'target_items'))
+                or (self.target_type == self.TargetType.ITEM_GROUP and item and item.item_group_id not in _related_ids(self, 'target_item_groups'))
+                or (self.target_type == self.TargetType.STORE_GROUP and item and item.item_group.store_group_id not in _related_ids(self, 'target_store_groups'))
+            )
+        return cache[key]
+
+    def apply(self, price: Decimal, quantity: int = 1, user: Optional[User] = None, now: Optional[datetime] = None) -> Dict:
         """Apply the offer to a given price and return the result."""
-        logger = Logger(__name__, user=user, branch_id=self.branch.id)
+        logger = Logger(__name__, user=user, branch_id=self.branch_id)
         result = {'original_price': price, 'discounted_price': price, 'points_earned': 0, 'free_items': 0}
         
-        if not self.is_valid(user=user):
+        if not self.is_valid(user=user, now=now):
             logger.warning(f"Offer {self.code} is not valid for application", extra={'offer_id': self.id})
             return result
-
-        if self.offer_type == self.OfferType.DISCOUNT:
-            if self.discount_percentage > 0:
-                discount = price * (self.discount_percentage / 100)
-                result['discounted_price'] = max(price - discount, Decimal('0'))
-            elif self.discount_amount > 0:
-                result['discounted_price'] = max(price - self.discount_amount, Decimal('0'))
-        elif self.offer_type == self.OfferType.BUY_X_GET_Y:
-            if quantity >= self.buy_quantity:
-                result['free_items'] = (quantity // self.buy_quantity) * self.get_quantity
-        elif self.offer_type == self.OfferType.LOYALTY_POINTS:
-            result['points_earned'] = self.loyalty_points_earned * quantity
-        elif self.offer_type == self.OfferType.FREE_SHIPPING:
-            result['discounted_price'] = price
-        elif self.offer_type == self.OfferType.BUNDLE:
-            result['discounted_price'] = price
-        
+        if not _consume_use(Offer, self.pk):
+            logger.warning(f"Offer {self.code} has no uses left", extra={'offer_id': self.id})
+            return result
         self.current_uses += 1
-        self.save(update_fields=['current_uses'])
+
+        self._price_line(result, price, quantity)
         logger.info(f"Applied offer {self.code} to price {price}", extra={'offer_id': self.id, 'result': result})
         return result
 
+    def apply_bulk(self, lines: List[Tuple[Decimal, int]], user: Optional[User] = None,
+                   now: Optional[datetime] = None) -> List[Dict]:
+        """Apply the offer to several (price, quantity) cart lines at once.
+
+        Validation runs once and all uses are taken in a single UPDATE, instead
+        of once per line as repeated ``apply`` calls would.
+        """
+        logger = Logger(__name__, user=user, branch_id=self.branch_id)
+        results = [
+            {'original_price': price, 'discounted_price': price, 'points_earned': 0, 'free_items': 0}
+            for price, _ in lines
+        ]
+        if not lines:
+            return results
+
+        if not self.is_valid(user=user, now=now):
+            logger.warning(f"Offer {self.code} is not valid for application", extra={'offer_id': self.id})
+            return results
+        if not _consume_use(Offer, self.pk, len(lines)):
+            logger.warning(f"Offer {self.code} has not enough uses left for {len(lines)} lines", extra={'offer_id': self.id})
+            return results
+        self.current_uses += len(lines)
+
+        for result, (price, quantity) in zip(results, lines):
+            self._price_line(result, price, quantity)
+        logger.info(f"Applied offer {self.code} to {len(lines)} lines", extra={'offer_id': self.id})
+        return results
+
+    @property
+    def _discount_units(self) -> Tuple[int, int]:
+        """(percentage, amount) as scaled ints, converted again only when either field is reassigned."""
+        source = (self.discount_percentage, self.discount_amount)
+        cached = self.__dict__.get('_discount_units_cache')
+        if cached is None or cached[0][0] is not source[0] or cached[0][1] is not source[1]:
+            cached = (source, (to_scaled_int(source[0]), to_scaled_int(source[1])))
+            self.__dict__['_discount_units_cache'] = cached
+        return cached[1]
+
+    def _apply_discount(self, result: Dict, price: Decimal, quantity: int):
+        percent_units, amount_units = self._discount_units
+        if percent_units > 0 or amount_units > 0:
+            result['discounted_price'] = from_scaled_int(apply_discount(to_scaled_int(price), percent_units, amount_units))
+
+    def _apply_buy_x_get_y(self, result: Dict, price: Decimal, quantity: int):
+        result['free_items'] = apply_bxgy(quantity, self.buy_quantity, self.get_quantity)
+
+    def _apply_loyalty_points(self, result: Dict, price: Decimal, quantity: int):
+        result['points_earned'] = self.loyalty_points_earned * quantity
+
+    def _apply_unchanged_price(self, result: Dict, price: Decimal, quantity: int):
+        # Free shipping and bundle offers leave the line price unchanged.
+        result['discounted_price'] = price
+
+    _APPLIERS = {
+        OfferType.DISCOUNT: _apply_discount,
+        OfferType.BUY_X_GET_Y: _apply_buy_x_get_y,
+        OfferType.LOYALTY_POINTS: _apply_loyalty_points,
+        OfferType.FREE_SHIPPING: _apply_unchanged_price,
+        OfferType.BUNDLE: _apply_unchanged_price,
+    }
+
+    def _price_line(self, result: Dict, price: Decimal, quantity: int):
+        """Fill ``result`` with the effect of this offer on one line."""
+        applier = self._APPLIERS.get(self.offer_type)
+        if applier:
+            applier(self, result, price, quantity)
+
+    def notification_context(self) -> Dict:
+        """Template context for notifications about this offer."""
+        return {
+            'offer_name': self.name,
+            'offer_code': self.code,
+            'description': self.description,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat()
+        }
+
     def notify_users(self, users: Optional[List[User]] = None):
-        """Notify targeted users about the offer."""
-        service = MessagingService(self.branch)
-        recipients = users or self.target_users.all() if self.target_type == self.TargetType.USER else User.objects.filter(default_branch=self.branch)
-        for user in recipients:
-            if user.profile and user.profile.can_receive_notifications('email'):
-                try:
-                    service.send_notification(
-                        recipient=user,
-                        notification_type='custom',
-                        context_data={
-                            'offer_name': self.name,
-                            'offer_code': self.code,
-                            'description': self.description,
-                            'start_date': self.start_date.isoformat(),
-                            'end_date': self.end_date.isoformat()
-                        },
-                        channel='email',
-                        priority='normal'
-                    )
-                    logger.info(f"Notified user {user.username} about offer {self.code}", extra={'offer_id': self.id, 'user_id': user.id})
-                except Exception as e:
-                    logger.error(f"Error notifying user {user.username} about offer {self.code}: {str(e)}", extra={'offer_id': self.id, 'user_id': user.id}, exc_info=True)
+        """Queue notifications about the offer for targeted users."""
+        if self.target_type == self.TargetType.USER:
+            queued = _queue_notifications(self, users, self.target_users.all(), 'email')
+        else:
+            queued = _queue_notifications(self, None, User.objects.filter(default_branch_id=self.branch_id), 'email')
+        logger.info(f"Queued notifications about offer {self.code} for {queued} users", extra={'offer_id': self.id})
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.get_offer_type_display()})"
@@ -372,6 +587,12 @@ class Coupon(AuditableModel):
         related_name='coupons',
         verbose_name=_("Target Users")
     )
+    has_target_users = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name=_("Has Target Users"),
+        help_text=_("Kept in sync with target users so saves can skip the lookup")
+    )
     target_items = models.ManyToManyField(
         Item,
         blank=True,
@@ -393,12 +614,15 @@ class Coupon(AuditableModel):
         verbose_name=_("Terms and Conditions")
     )
 
+    objects = CouponManager()
+
     class Meta:
         verbose_name = _("Coupon")
         verbose_name_plural = _("Coupons")
         indexes = [
             models.Index(fields=['branch', 'code']),
             models.Index(fields=['is_active', 'start_date', 'end_date']),
+            models.Index(fields=['branch', 'end_date'], condition=Q(is_active=True), name='coupon_active_partial'),
         ]
         constraints = [
             models.CheckConstraint(
@@ -416,60 +640,56 @@ class Coupon(AuditableModel):
         if self.coupon_type == self.CouponType.PERCENTAGE and (self.value < 0 or self.value > 100):
             raise ValidationError({'value': _('Percentage value must be between 0 and 100.')})
 
-    def is_valid(self, user: Optional[User] = None, order_amount: Decimal = Decimal('0')) -> bool:
+    def is_valid(self, user: Optional[User] = None, order_amount: Decimal = Decimal('0'),
+                 now: Optional[datetime] = None) -> bool:
         """Check if the coupon is valid for the given context."""
-        now = timezone.now()
+        now = now or timezone.now()
         if not self.is_active or now < self.start_date or now > self.end_date:
             return False
         if self.max_uses > 0 and self.current_uses >= self.max_uses:
             return False
         if self.min_order_amount > 0 and order_amount < self.min_order_amount:
             return False
-        if self.target_users.exists() and user and not self.target_users.filter(id=user.id).exists():
-            return False
+        if user:
+            target_user_ids = _related_ids(self, 'target_users')
+            if target_user_ids and user.id not in target_user_ids:
+                return False
         return True
 
-    def apply(self, price: Decimal, user: Optional[User] = None) -> Decimal:
+    def apply(self, price: Decimal, user: Optional[User] = None, now: Optional[datetime] = None) -> Decimal:
         """Apply the coupon to a given price."""
-        logger = Logger(__name__, user=user, branch_id=self.branch.id)
-        if not self.is_valid(user=user, order_amount=price):
+        logger = Logger(__name__, user=user, branch_id=self.branch_id)
+        if not self.is_valid(user=user, order_amount=price, now=now):
             logger.warning(f"Coupon {self.code} is not valid for application", extra={'coupon_id': self.id})
             return price
+        if not _consume_use(Coupon, self.pk):
+            logger.warning(f"Coupon {self.code} has no uses left", extra={'coupon_id': self.id})
+            return price
+        self.current_uses += 1
 
+        value_units = to_scaled_int(self.value)
         if self.coupon_type == self.CouponType.PERCENTAGE:
-            discount = price * (self.value / 100)
-            discounted_price = max(price - discount, Decimal('0'))
+            discounted_price = from_scaled_int(apply_discount(to_scaled_int(price), value_units, 0))
         else:
-            discounted_price = max(price - self.value, Decimal('0'))
+            discounted_price = from_scaled_int(apply_discount(to_scaled_int(price), 0, value_units))
 
-        self.current_uses += 1
-        self.save(update_fields=['current_uses'])
         logger.info(f"Applied coupon {self.code} to price {price}", extra={'coupon_id': self.id, 'discounted_price': str(discounted_price)})
         return discounted_price
 
+    def notification_context(self) -> Dict:
+        """Template context for notifications about this coupon."""
+        return {
+            'coupon_name': self.name,
+            'coupon_code': self.code,
+            'description': self.description,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat()
+        }
+
     def notify_users(self, users: Optional[List[User]] = None):
-        """Notify targeted users about the coupon."""
-        service = MessagingService(self.branch)
-        recipients = users or self.target_users.all()
-        for user in recipients:
-            if user.profile and user.profile.can_receive_notifications('email'):
-                try:
-                    service.send_notification(
-                        recipient=user,
-                        notification_type='custom',
-                        context_data={
-                            'coupon_name': self.name,
-                            'coupon_code': self.code,
-                            'description': self.description,
-                            'start_date': self.start_date.isoformat(),
-                            'end_date': self.end_date.isoformat()
-                        },
-                        channel='email',
-                        priority='normal'
-                    )
-                    logger.info(f"Notified user {user.username} about coupon {self.code}", extra={'coupon_id': self.id, 'user_id': user.id})
-                except Exception as e:
-                    logger.error(f"Error notifying user {user.username} about coupon {self.code}: {str(e)}", extra={'coupon_id': self.id, 'user_id': user.id}, exc_info=True)
+        """Queue notifications about the coupon for targeted users."""
+        queued = _queue_notifications(self, users, self.target_users.all(), 'email')
+        logger.info(f"Queued notifications about coupon {self.code} for {queued} users", extra={'coupon_id': self.id})
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.get_coupon_type_display()})"
@@ -518,6 +738,7 @@ class UserCoupon(AuditableModel):
         indexes = [
             models.Index(fields=['user', 'coupon']),
             models.Index(fields=['redemption_date', 'is_used']),
+            models.Index(fields=['coupon', 'is_used']),
         ]
 
     def clean(self):
@@ -527,7 +748,7 @@ class UserCoupon(AuditableModel):
 
     def mark_as_used(self, transaction):
         """Mark coupon as used for a specific transaction."""
-        logger = Logger(__name__, user=self.user, branch_id=self.branch.id)
+        logger = Logger(__name__, user=self.user, branch_id=self.branch_id)
         self.is_used = True
         self.order = transaction
         self.save(update_fields=['is_used', 'order'])
@@ -650,6 +871,8 @@ class Campaign(AuditableModel):
         verbose_name=_("Analytics Data")
     )
 
+    objects = CampaignManager()
+
     class Meta:
         verbose_name = _("Campaign")
         verbose_name_plural = _("Campaigns")
@@ -657,6 +880,7 @@ class Campaign(AuditableModel):
             models.Index(fields=['branch', 'code']),
             models.Index(fields=['slug', 'is_active', 'start_date', 'end_date']),
             models.Index(fields=['campaign_type']),
+            models.Index(fields=['branch', 'end_date'], condition=Q(is_active=True), name='campaign_active_partial'),
         ]
         constraints = [
             models.CheckConstraint(
@@ -690,58 +914,63 @@ class Campaign(AuditableModel):
         else:
             self.conversion_rate = Decimal('0.00')
 
+    def record_impressions(self, count: int):
+        """Add ``count`` impressions and refresh the conversion rate in a single UPDATE."""
+        Campaign.objects.filter(pk=self.pk).update(
+            impressions=F('impressions') + count,
+            conversion_rate=_conversion_rate(F('impressions') + count, F('conversions'))
+        )
+        transaction.on_commit(partial(bump_list_revision, 'Campaign'))
+        self.impressions += count
+        self.update_conversion_rate()
+
     def track_impression(self):
         """Track a campaign impression."""
-        self.impressions += 1
-        self.update_conversion_rate()
-        self.save(update_fields=['impressions', 'conversion_rate'])
+        self.record_impressions(1)
         logger.info(f"Tracked impression for campaign {self.code}", extra={'campaign_id': self.id, 'impressions': self.impressions})
 
     def track_click(self):
         """Track a campaign click."""
+        Campaign.objects.filter(pk=self.pk).update(clicks=F('clicks') + 1)
+        transaction.on_commit(partial(bump_list_revision, 'Campaign'))
         self.clicks += 1
-        self.save(update_fields=['clicks'])
         logger.info(f"Tracked click for campaign {self.code}", extra={'campaign_id': self.id, 'clicks': self.clicks})
 
     def track_conversion(self, user: Optional[User] = None):
         """Track a campaign conversion."""
-        logger = Logger(__name__, user=user, branch_id=self.branch.id)
+        logger = Logger(__name__, user=user, branch_id=self.branch_id)
+        Campaign.objects.filter(pk=self.pk).update(
+            conversions=F('conversions') + 1,
+            conversion_rate=_conversion_rate(F('impressions'), F('conversions') + 1)
+        )
+        transaction.on_commit(partial(bump_list_revision, 'Campaign'))
         self.conversions += 1
         self.update_conversion_rate()
-        self.save(update_fields=['conversions', 'conversion_rate'])
         logger.info(f"Tracked conversion for campaign {self.code}", extra={'campaign_id': self.id, 'conversions': self.conversions, 'user_id': user.id if user else None})
 
+    def notification_context(self) -> Dict:
+        """Template context for notifications about this campaign."""
+        context_data = {
+            'campaign_name': self.name,
+            'campaign_code': self.code,
+            'content': self.content,
+            'call_to_action': self.call_to_action,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+        }
+        if self.offer:
+            context_data['offer_code'] = self.offer.code
+        if self.coupon:
+            context_data['coupon_code'] = self.coupon.code
+        return context_data
+
     def launch(self, users: Optional[List[User]] = None):
-        """Launch the campaign by notifying targeted users."""
-        service = MessagingService(self.branch)
-        recipients = users or self.target_users.all()
-        for user in recipients:
-            if user.profile and user.profile.can_receive_notifications(self.campaign_type):
-                try:
-                    context_data = {
-                        'campaign_name': self.name,
-                        'campaign_code': self.code,
-                        'content': self.content,
-                        'call_to_action': self.call_to_action,
-                        'start_date': self.start_date.isoformat(),
-                        'end_date': self.end_date.isoformat(),
-                    }
-                    if self.offer:
-                        context_data['offer_code'] = self.offer.code
-                    if self.coupon:
-                        context_data['coupon_code'] = self.coupon.code
-                    service.send_notification(
-                        recipient=user,
-                        notification_type='custom',
-                        context_data=context_data,
-                        channel=self.campaign_type,
-                        priority='normal'
-                    )
-                    self.track_impression()
-                    logger.info(f"Launched campaign {self.code} to user {user.username}", extra={'campaign_id': self.id, 'user_id': user.id})
-                except Exception as e:
-                    logger.error(f"Error launching campaign {self.code} to user {user.username}: {str(e)}", 
-                                extra={'campaign_id': self.id, 'user_id': user.id}, exc_info=True)
+        """Launch the campaign by queueing notifications for targeted users.
+
+        Impressions are recorded by the notification tasks as batches are sent.
+        """
+        queued = _queue_notifications(self, users, self.target_users.all(), self.campaign_type)
+        logger.info(f"Launched campaign {self.code} to {queued} users", extra={'campaign_id': self.id})
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.get_campaign_type_display()})"
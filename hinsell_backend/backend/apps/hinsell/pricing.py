@@ -0,0 +1,24 @@
+"""
+Integer pricing kernels shared by offers and coupons.
+
+Amounts and percentages are passed as scaled integers (see
+``apps.core_apps.utils.to_scaled_int``) so the arithmetic stays in plain ints
+and Decimals are only built at the model boundary.
+"""
+from apps.core_apps.utils import AMOUNT_SCALE
+
+PERCENT_DIVISOR = 100 * AMOUNT_SCALE
+
+
+def apply_discount(price_units: int, percent_units: int, flat_units: int) -> int:
+    """Return the discounted price; a percentage discount takes precedence over a flat one."""
+    if percent_units > 0:
+        return max(price_units - price_units * percent_units // PERCENT_DIVISOR, 0)
+    return max(price_units - flat_units, 0)
+
+
+def apply_bxgy(quantity: int, buy_quantity: int, get_quantity: int) -> int:
+    """Return the number of free items earned by a Buy X Get Y offer."""
+    if buy_quantity <= 0 or quantity < buy_quantity:
+        return 0
+    return (quantity // buy_quantity) * get_quantity
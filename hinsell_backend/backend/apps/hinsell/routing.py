@@ -1,8 +1,8 @@
-from django.urls import re_path
+from django.urls import path
 from apps.hinsell.consumers import MessagingConsumer, TransactionConsumer, NotificationConsumer
 
 websocket_urlpatterns = [
-    re_path(r'ws/messaging/$', MessagingConsumer.as_asgi()),
-    re_path(r'ws/transactions/$', TransactionConsumer.as_asgi()),
-    re_path(r'ws/notifications/$', NotificationConsumer.as_asgi()),
+    path('ws/messaging/', MessagingConsumer.as_asgi()),
+    path('ws/transactions/', TransactionConsumer.as_asgi()),
+    path('ws/notifications/', NotificationConsumer.as_asgi()),
 ]
\ No newline at end of file
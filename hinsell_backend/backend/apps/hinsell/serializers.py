@@ -1,21 +1,27 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from apps.hinsell.models import Offer, Coupon, UserCoupon, Campaign
 from apps.inventory.models import Item, ItemGroup, StoreGroup
 from apps.authentication.models import User
 from apps.organization.models import Branch
 from apps.shared.serializers import MediaSerializer
+from apps.core_apps.fields import BulkPrimaryKeyRelatedField, CachedFieldsMixin
 
-class OfferSerializer(serializers.ModelSerializer):
-    target_users = serializers.PrimaryKeyRelatedField(
+# Only primary keys are rendered for these relations.
+TARGET_USERS = Prefetch('target_users', queryset=User.objects.only('id'))
+TARGET_ITEMS = Prefetch('target_items', queryset=Item.objects.select_related(None).only('id'))
+
+class OfferSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    target_users = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(), many=True, required=False
     )
-    target_items = serializers.PrimaryKeyRelatedField(
+    target_items = BulkPrimaryKeyRelatedField(
         queryset=Item.objects.all(), many=True, required=False
     )
-    target_item_groups = serializers.PrimaryKeyRelatedField(
+    target_item_groups = BulkPrimaryKeyRelatedField(
         queryset=ItemGroup.objects.all(), many=True, required=False
     )
-    target_store_groups = serializers.PrimaryKeyRelatedField(
+    target_store_groups = BulkPrimaryKeyRelatedField(
         queryset=StoreGroup.objects.all(), many=True, required=False
     )
     media = MediaSerializer(many=True, read_only=True)
@@ -32,6 +38,16 @@ class OfferSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['code', 'slug', 'current_uses', 'created_at', 'updated_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('branch').prefetch_related(
+            TARGET_USERS,
+            TARGET_ITEMS,
+            Prefetch('target_item_groups', queryset=ItemGroup.objects.only('id')),
+            Prefetch('target_store_groups', queryset=StoreGroup.objects.only('id')),
+            'media',
+        )
+
     def validate(self, data):
         if data.get('start_date') and data.get('end_date'):
             if data['start_date'] >= data['end_date']:
@@ -43,11 +59,11 @@ class OfferSerializer(serializers.ModelSerializer):
                 })
         return data
 
-class CouponSerializer(serializers.ModelSerializer):
-    target_users = serializers.PrimaryKeyRelatedField(
+class CouponSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    target_users = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(), many=True, required=False
     )
-    target_items = serializers.PrimaryKeyRelatedField(
+    target_items = BulkPrimaryKeyRelatedField(
         queryset=Item.objects.all(), many=True, required=False
     )
     media = MediaSerializer(many=True, read_only=True)
@@ -61,12 +77,16 @@ class CouponSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['code', 'current_uses', 'created_at', 'updated_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('branch').prefetch_related(TARGET_USERS, TARGET_ITEMS, 'media')
+
     def validate(self, data):
         if data.get('coupon_type') == Coupon.CouponType.PERCENTAGE and data.get('value', 0) > 100:
             raise serializers.ValidationError({'value': 'Percentage value must be between 0 and 100.'})
         return data
 
-class UserCouponSerializer(serializers.ModelSerializer):
+class UserCouponSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
     coupon = serializers.PrimaryKeyRelatedField(queryset=Coupon.objects.all())
     branch = serializers.PrimaryKeyRelatedField(queryset=Branch.objects.all())
@@ -79,8 +99,12 @@ class UserCouponSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['redemption_date', 'created_at', 'updated_at']
 
-class CampaignSerializer(serializers.ModelSerializer):
-    target_users = serializers.PrimaryKeyRelatedField(
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('user', 'coupon', 'branch', 'order')
+
+class CampaignSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    target_users = BulkPrimaryKeyRelatedField(
         queryset=User.objects.all(), many=True, required=False
     )
     offer = serializers.PrimaryKeyRelatedField(
@@ -104,6 +128,10 @@ class CampaignSerializer(serializers.ModelSerializer):
             'analytics_data', 'created_at', 'updated_at'
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related('branch', 'offer', 'coupon').prefetch_related(TARGET_USERS, 'media')
+
     def validate(self, data):
         if not data.get('offer') and not data.get('coupon'):
             raise serializers.ValidationError({
@@ -1,77 +1,102 @@
+from functools import partial
 from django.utils import timezone
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-from django.core.cache import cache
-from apps.hinsell.models import Offer, Coupon, UserCoupon, Campaign
-from apps.hinsell.tasks import update_algolia_index, delete_algolia_index
 from apps.hinsell.models import Offer, Coupon, UserCoupon, Campaign
+from apps.hinsell.cache import bump_list_revision, bump_offers_revision, forget_campaign_trackable
+from apps.hinsell.tasks import (
+    broadcast_notification_update, broadcast_transaction_update, notify_coupon_users
+)
 from apps.transactions.models import TransactionHeader
 from apps.notifications.models import Notification
+from apps.core_apps.indexing import queue_reindex
 from apps.core_apps.utils import Logger
 
 logger = Logger(__name__)
 
-
-
 @receiver(post_save, sender=TransactionHeader)
 def transaction_status_updated(sender, instance, **kwargs):
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f'user_{instance.created_by_id}',
-        {
-            'type': 'transaction_update',
-            'transaction_id': instance.id,
-            'status': instance.status,
-            'updated_at': instance.updated_at.isoformat(),
-        }
-    )
-    async_to_sync(channel_layer.group_send)(
-        f'branch_{instance.branch_id}',
-        {
-            'type': 'transaction_update',
-            'transaction_id': instance.id,
-            'status': instance.status,
-            'updated_at': instance.updated_at.isoformat(),
-        }
-    )
+    transaction.on_commit(partial(
+        broadcast_transaction_update.delay,
+        str(instance.id), str(instance.created_by_id), str(instance.branch_id),
+        instance.status, instance.updated_at.isoformat()
+    ))
     logger.info(f"Transaction {instance.transaction_number} status updated to {instance.status}")
 
 @receiver(post_save, sender=Notification)
 def notification_created(sender, instance, created, **kwargs):
     if created or instance.status in ['PENDING', 'SENT']:
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'user_{instance.recipient_id}',
-            {
-                'type': 'notification_update',
-                'notification_id': instance.id,
-                'message': instance.message,
-                'status': instance.status,
-                'created_at': instance.created_at.isoformat(),
-            }
-        )
+        transaction.on_commit(partial(
+            broadcast_notification_update.delay,
+            str(instance.id), str(instance.recipient_id), instance.message,
+            instance.status, instance.created_at.isoformat()
+        ))
         logger.info(f"Notification {instance.id} sent to user {instance.recipient_id}")
 
 @receiver(post_save, sender=Offer)
-def clear_offer_cache(sender, instance, **kwargs):
-    """Clear offer cache on save."""
-    cache.delete(f"active_offers_{instance.branch.id}")
-    logger.info(f"Cleared offer cache for branch {instance.branch.id}", extra={'offer_id': instance.id})
+@receiver(post_delete, sender=Offer)
+def bump_offer_cache_revision(sender, instance, **kwargs):
+    """Move the branch to a new offer cache generation on save or delete."""
+    transaction.on_commit(partial(bump_offers_revision, instance.branch_id))
+    logger.info(f"Bumped offer cache revision for branch {instance.branch_id}", extra={'offer_id': instance.id})
 
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=Coupon)
+@receiver(post_save, sender=Campaign)
 @receiver(post_delete, sender=Offer)
-def clear_offer_cache_on_delete(sender, instance, **kwargs):
-    """Clear offer cache on delete."""
-    cache.delete(f"active_offers_{instance.branch.id}")
-    logger.info(f"Cleared offer cache on delete for branch {instance.branch.id}", extra={'offer_id': instance.id})
+@receiver(post_delete, sender=Coupon)
+@receiver(post_delete, sender=Campaign)
+def bump_promotion_list_revision(sender, instance, **kwargs):
+    """Invalidate the list ETags of the promotion model that changed."""
+    transaction.on_commit(partial(bump_list_revision, sender.__name__))
+
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def forget_campaign_tracking_state(sender, instance, **kwargs):
+    """Re-check soft deletion on the next tracking request."""
+    transaction.on_commit(partial(forget_campaign_trackable, instance.pk))
+
+# The list serializers render every many-to-many relation of these models.
+_PROMOTION_THROUGH_MODELS = {
+    field.remote_field.through: model.__name__
+    for model in (Offer, Coupon, Campaign)
+    for field in model._meta.many_to_many
+}
+
+def bump_promotion_list_revision_on_m2m(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(partial(bump_list_revision, _PROMOTION_THROUGH_MODELS[sender]))
+
+for _through in _PROMOTION_THROUGH_MODELS:
+    m2m_changed.connect(bump_promotion_list_revision_on_m2m, sender=_through)
 
 @receiver(post_save, sender=Coupon)
 def notify_new_coupon(sender, instance, created, **kwargs):
     """Notify target users about new coupons."""
-    if created and instance.target_users.exists():
-        instance.notify_users()
-        logger.info(f"Notified users about new coupon {instance.code}", extra={'coupon_id': instance.id})
+    if created and instance.has_target_users:
+        transaction.on_commit(partial(notify_coupon_users.delay, str(instance.pk)))
+        logger.info(f"Queued notifications about new coupon {instance.code}", extra={'coupon_id': instance.id})
+
+@receiver(m2m_changed, sender=Coupon.target_users.through)
+def update_coupon_has_target_users(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Coupon.has_target_users in step with its target users."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        coupons = Coupon.objects.filter(pk=instance.pk)
+    elif pk_set:
+        coupons = Coupon.objects.filter(pk__in=pk_set)
+    else:
+        # A user's coupons were cleared; only coupons still flagged can have changed.
+        coupons = Coupon.objects.filter(has_target_users=True)
+    coupons.update(has_target_users=Exists(sender.objects.filter(coupon_id=OuterRef('pk'))))
+    if not reverse:
+        # Keep the in-memory flag current so a later save() does not write back a stale value.
+        instance.has_target_users = action == 'post_add' or (
+            action == 'post_remove' and instance.target_users.exists()
+        )
 
 @receiver(post_save, sender=UserCoupon)
 def log_coupon_redemption(sender, instance, created, **kwargs):
@@ -88,40 +113,16 @@ def launch_new_campaign(sender, instance, created, **kwargs):
         logger.info(f"Launched new campaign {instance.code}", extra={'campaign_id': instance.id})
 
 @receiver(post_save, sender=Offer)
-def handle_offer_save(sender, instance, **kwargs):
-    update_algolia_index.delay('hinsell', 'Offer', str(instance.pk))
-
-
-@receiver(post_delete, sender=Offer)
-def handle_offer_delete(sender, instance, **kwargs):
-    delete_algolia_index.delay('hinsell', 'Offer', str(instance.pk))
-
-
 @receiver(post_save, sender=Coupon)
-def handle_coupon_save(sender, instance, **kwargs):
-    update_algolia_index.delay('hinsell', 'Coupon', str(instance.pk))
-
-
-@receiver(post_delete, sender=Coupon)
-def handle_coupon_delete(sender, instance, **kwargs):
-    delete_algolia_index.delay('hinsell', 'Coupon', str(instance.pk))
-
-
 @receiver(post_save, sender=UserCoupon)
-def handle_user_coupon_save(sender, instance, **kwargs):
-    update_algolia_index.delay('hinsell', 'UserCoupon', str(instance.pk))
-
-
-@receiver(post_delete, sender=UserCoupon)
-def handle_user_coupon_delete(sender, instance, **kwargs):
-    delete_algolia_index.delay('hinsell', 'UserCoupon', str(instance.pk))
-
-
 @receiver(post_save, sender=Campaign)
-def handle_campaign_save(sender, instance, **kwargs):
-    update_algolia_index.delay('hinsell', 'Campaign', str(instance.pk))
+def handle_promotion_save(sender, instance, using, **kwargs):
+    queue_reindex(instance, using)
 
 
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=Coupon)
+@receiver(post_delete, sender=UserCoupon)
 @receiver(post_delete, sender=Campaign)
-def handle_campaign_delete(sender, instance, **kwargs):
-    delete_algolia_index.delay('hinsell', 'Campaign', str(instance.pk))
\ No newline at end of file
+def handle_promotion_delete(sender, instance, using, **kwargs):
+    queue_reindex(instance, using)
@@ -1,45 +1,84 @@
+import asyncio
+from itertools import islice
 from celery import shared_task
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.apps import apps
 from django.utils import timezone
-from django.core.cache import cache
+from apps.authentication.models import User
+from apps.hinsell.cache import bump_list_revision, bump_offers_revision, incr_campaign_counter, pop_campaign_counters
 from apps.hinsell.models import Offer, Campaign, UserCoupon,Coupon
+from apps.core_apps.tasks import update_algolia_index_bulk
+from apps.core_apps.services.messaging_service import MessagingService
 from apps.core_apps.utils import Logger
 
 logger = Logger(__name__)
 
+USER_COUPON_DELETE_CHUNK_SIZE = 10000
+OFFER_CHUNK_SIZE = 100
+
+def _deactivate_expired(model, now):
+    """Flip is_active on expired rows with a single UPDATE; returns the (id, code, branch_id) rows touched."""
+    rows = list(model.objects.filter(end_date__lt=now, is_active=True).values_list('id', 'code', 'branch_id'))
+    if rows:
+        pks = [pk for pk, _, _ in rows]
+        model.objects.filter(pk__in=pks).update(is_active=False, updated_at=now)
+        bump_list_revision(model.__name__)
+        # update() skips post_save, so the search index has to be synced by hand.
+        update_algolia_index_bulk.delay('hinsell', model.__name__, [str(pk) for pk in pks])
+    return rows
+
 @shared_task
 def deactivate_expired_promotions():
     """Deactivate expired offers and campaigns."""
     now = timezone.now()
-    expired_offers = Offer.objects.filter(end_date__lt=now, is_active=True)
-    expired_campaigns = Campaign.objects.filter(end_date__lt=now, is_active=True)
-    
-    for offer in expired_offers:
-        offer.is_active = False
-        offer.save(update_fields=['is_active'])
-        cache.delete(f"active_offers_{offer.branch.id}")
-        logger.info(f"Deactivated expired offer {offer.code}", extra={'offer_id': offer.id})
-    
-    for campaign in expired_campaigns:
-        campaign.is_active = False
-        campaign.save(update_fields=['is_active'])
-        logger.info(f"Deactivated expired campaign {campaign.code}", extra={'campaign_id': campaign.id})
-    
-    return f"Deactivated {expired_offers.count()} offers and {expired_campaigns.count()} campaigns"
+    expired_offers = _deactivate_expired(Offer, now)
+    expired_campaigns = _deactivate_expired(Campaign, now)
+
+    for offer_id, code, _ in expired_offers:
+        logger.info(f"Deactivated expired offer {code}", extra={'offer_id': offer_id})
+    for campaign_id, code, _ in expired_campaigns:
+        logger.info(f"Deactivated expired campaign {code}", extra={'campaign_id': campaign_id})
+    for branch_id in {branch_id for _, _, branch_id in expired_offers}:
+        bump_offers_revision(branch_id)
+    return f"Deactivated {len(expired_offers)} offers and {len(expired_campaigns)} campaigns"
 
 @shared_task
 def notify_upcoming_offers():
-    """Notify users about offers starting within the next 24 hours."""
+    """Queue notifications about offers starting within the next 24 hours, in chunks of offers."""
     now = timezone.now()
-    upcoming_offers = Offer.objects.filter(
+    upcoming_offer_ids = Offer.objects.filter(
         start_date__gte=now,
         start_date__lte=now + timezone.timedelta(hours=24),
         is_active=True
-    )
-    for offer in upcoming_offers:
+    ).values_list('id', flat=True).iterator(chunk_size=OFFER_CHUNK_SIZE)
+
+    count = 0
+    while True:
+        chunk = [str(offer_id) for offer_id in islice(upcoming_offer_ids, OFFER_CHUNK_SIZE)]
+        if not chunk:
+            break
+        notify_offers.delay(chunk)
+        count += len(chunk)
+
+    return f"Queued notifications about {count} upcoming offers"
+
+@shared_task
+def notify_offers(offer_ids):
+    """Queue user notifications for a chunk of offers."""
+    for offer in Offer.objects.filter(pk__in=offer_ids):
         offer.notify_users()
         logger.info(f"Notified users about upcoming offer {offer.code}", extra={'offer_id': offer.id})
-    
-    return f"Notified users about {upcoming_offers.count()} upcoming offers"
+
+@shared_task
+def notify_coupon_users(coupon_id):
+    """Notify the target users of a coupon."""
+    try:
+        coupon = Coupon.objects.get(pk=coupon_id)
+    except Coupon.DoesNotExist:
+        logger.warning(f"Coupon {coupon_id} no longer exists, skipping notifications")
+        return
+    coupon.notify_users()
 
 @shared_task
 def clean_expired_user_coupons():
@@ -49,7 +88,97 @@ def clean_expired_user_coupons():
         coupon__end_date__lt=now,
         is_used=False
     )
-    count = expired_user_coupons.count()
-    expired_user_coupons.delete()
+    count = 0
+    while True:
+        pks = list(expired_user_coupons.values_list('pk', flat=True)[:USER_COUPON_DELETE_CHUNK_SIZE])
+        if not pks:
+            break
+        # Nothing references UserCoupon, so each slice is removed with one DELETE,
+        # skipping the collector and per-row signals; the index is synced explicitly.
+        UserCoupon.objects.filter(pk__in=pks)._raw_delete(using=UserCoupon.objects.db)
+        update_algolia_index_bulk.delay('hinsell', 'UserCoupon', [str(pk) for pk in pks])
+        count += len(pks)
     logger.info(f"Cleaned {count} expired user coupons")
-    return f"Cleaned {count} expired user coupons"
\ No newline at end of file
+    return f"Cleaned {count} expired user coupons"
+
+@shared_task
+def send_promotion_notifications(model_name, object_id, user_ids, channel):
+    """Send one batch of offer, coupon or campaign notifications."""
+    model = apps.get_model('hinsell', model_name)
+    try:
+        promotion = model.objects.get(pk=object_id)
+    except model.DoesNotExist:
+        logger.warning(f"{model.__name__} {object_id} no longer exists, skipping notifications")
+        return 0
+
+    recipients = [
+        user for user in User.objects.filter(pk__in=user_ids).select_related('profile')
+        if getattr(user, 'profile', None) and user.profile.can_receive_notifications(channel)
+    ]
+    if not recipients:
+        return 0
+
+    try:
+        sent = len(MessagingService(promotion.branch).send_notification_bulk(
+            recipients=recipients,
+            notification_type='custom',
+            context_data=promotion.notification_context(),
+            channel=channel,
+            priority='normal'
+        ))
+    except Exception as e:
+        logger.error(f"Error notifying {len(recipients)} users about {model.__name__} {promotion.code}: {str(e)}",
+                     extra={'object_id': object_id}, exc_info=True)
+        return 0
+
+    if isinstance(promotion, Campaign):
+        promotion.record_impressions(sent)
+    logger.info(f"Notified {sent} users about {model.__name__} {promotion.code}", extra={'object_id': object_id})
+    return sent
+
+
+async def _group_send_all(channel_layer, groups, payload):
+    await asyncio.gather(*(channel_layer.group_send(group, payload) for group in groups))
+
+@shared_task
+def broadcast_transaction_update(transaction_id, user_id, branch_id, status, updated_at):
+    """Push a transaction status change to its creator and branch websocket groups."""
+    payload = {
+        'type': 'transaction_update',
+        'transaction_id': transaction_id,
+        'status': status,
+        'updated_at': updated_at,
+    }
+    async_to_sync(_group_send_all)(get_channel_layer(), [f'user_{user_id}', f'branch_{branch_id}'], payload)
+
+@shared_task
+def broadcast_notification_update(notification_id, recipient_id, message, status, created_at):
+    """Push a notification to its recipient's websocket group."""
+    payload = {
+        'type': 'notification_update',
+        'notification_id': notification_id,
+        'message': message,
+        'status': status,
+        'created_at': created_at,
+    }
+    async_to_sync(_group_send_all)(get_channel_layer(), [f'user_{recipient_id}'], payload)
+
+
+@shared_task
+def flush_campaign_counters():
+    """Write the impressions, clicks and conversions counted in the cache to the campaigns."""
+    pending = pop_campaign_counters()
+    for campaign_id, deltas in pending.items():
+        try:
+            if not Campaign.objects.add_tracking_counts(campaign_id, **deltas):
+                # Deleted since the events were counted; the drained keys are simply dropped.
+                logger.warning(f"Dropped tracking counters for missing campaign {campaign_id}",
+                               extra={'campaign_id': campaign_id})
+        except Exception as e:
+            # Put the counts back so the next flush retries them.
+            for field, delta in deltas.items():
+                incr_campaign_counter(campaign_id, field, delta)
+            logger.error(f"Error flushing counters for campaign {campaign_id}: {str(e)}",
+                         extra={'campaign_id': campaign_id}, exc_info=True)
+    logger.info(f"Flushed tracking counters for {len(pending)} campaigns")
+    return f"Flushed tracking counters for {len(pending)} campaigns"
@@ -1,14 +1,53 @@
+import hashlib
+import uuid
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from apps.core_apps.general import BaseViewSet
+from apps.hinsell.cache import campaign_is_trackable, get_list_revision, incr_campaign_counter
 from apps.hinsell.models import Offer, Coupon, UserCoupon, Campaign
 from apps.hinsell.serializers import OfferSerializer, CouponSerializer, UserCouponSerializer, CampaignSerializer
 from apps.core_apps.utils import Logger
 
-class OfferViewSet(BaseViewSet):
+logger = Logger(__name__)
+
+
+class RevisionETagListMixin:
+    """
+    Answer conditional list requests from the model's list revision.
+
+    The ETag covers the revision, the user (staff see inactive rows) and the
+    full query string, so a matching If-None-Match gets a 304 without
+    touching the database or the serializer.
+    """
+    list_max_age = 60
+
+    def get_list_etag(self, request):
+        revision = get_list_revision(self.queryset.model.__name__)
+        key = f"{revision}:{request.user.pk}:{request.get_full_path()}"
+        return f'"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"'
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=self.list_max_age)
+        return response
+
+
+class OfferViewSet(RevisionETagListMixin, BaseViewSet):
     queryset = Offer.objects.all()
     serializer_class = OfferSerializer
     filterset_fields = ['offer_type', 'target_type', 'is_active']
@@ -37,16 +76,18 @@ class OfferViewSet(BaseViewSet):
         price = request.data.get('price')
         quantity = request.data.get('quantity', 1)
         try:
-            price = Decimal(price)
-            quantity = int(quantity)
+            if not isinstance(price, Decimal):
+                price = Decimal(str(price))
+            if not isinstance(quantity, int):
+                quantity = int(quantity)
+            # Not memoized: every application consumes a use of the offer.
             result = offer.apply(price, quantity, user=request.user)
-            cache.delete(f"active_offers_{offer.branch.id}")
             return Response(result, status=status.HTTP_200_OK)
-        except (ValueError, TypeError) as e:
+        except (ValueError, TypeError, InvalidOperation) as e:
             logger.error(f"Error applying offer {offer.code}: {str(e)}", extra={'offer_id': offer.id, 'user_id': request.user.id})
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class CouponViewSet(BaseViewSet):
+class CouponViewSet(RevisionETagListMixin, BaseViewSet):
     queryset = Coupon.objects.all()
     serializer_class = CouponSerializer
     filterset_fields = ['coupon_type', 'is_active']
@@ -68,15 +109,18 @@ class CouponViewSet(BaseViewSet):
         coupon = self.get_object()
         price = request.data.get('price')
         try:
-            price = Decimal(price)
-            discounted_price = coupon.apply(price, user=request.user)
-            UserCoupon.objects.create(
-                user=request.user,
-                coupon=coupon,
-                branch=coupon.branch
-            )
+            if not isinstance(price, Decimal):
+                price = Decimal(str(price))
+            # The use counter and the redemption row must commit or roll back together.
+            with transaction.atomic():
+                discounted_price = coupon.apply(price, user=request.user)
+                UserCoupon(
+                    user=request.user,
+                    coupon=coupon,
+                    branch_id=coupon.branch_id
+                ).save(force_insert=True)
             return Response({'discounted_price': discounted_price}, status=status.HTTP_200_OK)
-        except (ValueError, TypeError) as e:
+        except (ValueError, TypeError, InvalidOperation) as e:
             logger.error(f"Error applying coupon {coupon.code}: {str(e)}", extra={'coupon_id': coupon.id, 'user_id': request.user.id})
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -97,7 +141,7 @@ class UserCouponViewSet(BaseViewSet):
             queryset = queryset.filter(user=self.request.user)
         return queryset
 
-class CampaignViewSet(BaseViewSet):
+class CampaignViewSet(RevisionETagListMixin, BaseViewSet):
     queryset = Campaign.objects.all()
     serializer_class = CampaignSerializer
     filterset_fields = ['campaign_type', 'is_active']
@@ -115,23 +159,37 @@ class CampaignViewSet(BaseViewSet):
         'track_conversion': [],
     }
 
+    def _track(self, pk, field):
+        """Count a tracking event in the cache; `flush_campaign_counters` writes it to the campaign."""
+        try:
+            campaign_id = str(uuid.UUID(str(pk)))
+        except ValueError:
+            raise NotFound()
+        # Any campaign that is not soft-deleted can be tracked, as before; unknown
+        # ids are rejected so they never create counter keys.
+        if not campaign_is_trackable(
+            campaign_id, lambda: Campaign.objects.filter(pk=campaign_id).exists()
+        ):
+            raise NotFound()
+        incr_campaign_counter(campaign_id, field)
+        return campaign_id
+
     @action(detail=True, methods=['post'])
     def track_impression(self, request, pk=None):
         """Track a campaign impression."""
-        campaign = self.get_object()
-        campaign.track_impression()
+        self._track(pk, 'impressions')
         return Response({'status': 'impression tracked'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
     def track_click(self, request, pk=None):
         """Track a campaign click."""
-        campaign = self.get_object()
-        campaign.track_click()
+        self._track(pk, 'clicks')
         return Response({'status': 'click tracked'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
     def track_conversion(self, request, pk=None):
         """Track a campaign conversion."""
-        campaign = self.get_object()
-        campaign.track_conversion(user=request.user)
-        return Response({'status': 'conversion tracked'}, status=status.HTTP_200_OK)
\ No newline at end of file
+        campaign_id = self._track(pk, 'conversions')
+        logger.info(f"Tracked conversion for campaign {campaign_id}",
+                    extra={'campaign_id': campaign_id, 'user_id': request.user.id})
+        return Response({'status': 'conversion tracked'}, status=status.HTTP_200_OK)
@@ -31,8 +31,9 @@ class InsuranceSubscriberAdmin(admin.ModelAdmin):
         """Filter queryset based on user branch."""
         queryset = super().get_queryset(request)
         if not request.user.is_superuser:
-            user_branch = getattr(request.user, 'default_branch', None)
-            if user_branch:
-                queryset = queryset.filter(branch=user_branch)
+            # The FK id is already on the user row; no Branch fetch needed.
+            user_branch_id = getattr(request.user, 'default_branch_id', None)
+            if user_branch_id:
+                queryset = queryset.filter(branch_id=user_branch_id)
         return queryset
 
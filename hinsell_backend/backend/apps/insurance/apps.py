@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InsuranceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.insurance'
+
+    def ready(self):
+        import apps.insurance.signals  # noqa: F401
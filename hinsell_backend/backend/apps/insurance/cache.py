@@ -0,0 +1,22 @@
+"""
+Generational cache keys for insurance subscriber list responses.
+
+Writers bump the revision of the subscriber's branch (and the all-branches
+revision superusers read); cached pages built from an older revision are
+never read again and expire on their own.
+"""
+from apps.core_apps.cache import bump_revision, get_revision
+
+SUBSCRIBERS_REVISION_KEY = 'insurance_subscribers_rev_{scope}'
+ALL_BRANCHES = 'all'
+
+
+def get_subscribers_revision(scope):
+    """Return the subscriber list revision for a branch id or ALL_BRANCHES, seeding it if missing."""
+    return get_revision(SUBSCRIBERS_REVISION_KEY.format(scope=scope))
+
+
+def bump_subscribers_revision(branch_id):
+    """Invalidate the cached subscriber lists of a branch and the all-branches lists."""
+    for scope in (branch_id, ALL_BRANCHES):
+        bump_revision(SUBSCRIBERS_REVISION_KEY.format(scope=scope))
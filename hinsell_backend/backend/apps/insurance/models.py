@@ -23,6 +23,10 @@ class InsuranceSubscriber(AuditableModel):
         verbose_name = _("Insurance Subscriber")
         verbose_name_plural = _("Insurance Subscribers")
         ordering = ['subscriber_name']
+        indexes = [
+            models.Index(fields=['subscriber_code']),
+            models.Index(fields=['branch', 'subscriber_code']),
+        ]
         
     def __str__(self):
         return f"{self.subscriber_name} ({self.insurance_company}) - {self.subscriber_code}"
\ No newline at end of file
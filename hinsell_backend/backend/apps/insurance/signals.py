@@ -0,0 +1,12 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.insurance.cache import bump_subscribers_revision
+from apps.insurance.models import InsuranceSubscriber
+
+
+@receiver(post_save, sender=InsuranceSubscriber)
+@receiver(post_delete, sender=InsuranceSubscriber)
+def bump_subscriber_list_revision(sender, instance, **kwargs):
+    transaction.on_commit(partial(bump_subscribers_revision, instance.branch_id))
@@ -1,26 +1,52 @@
 """
 API views for inventory app.
 """
+import hashlib
 import logging
-from apps.core_apps.general import BaseViewSet
+from django.core.cache import cache
+from rest_framework.response import Response
+from apps.core_apps.general import BaseViewSet, KeysetPagination
 from apps.core_apps.permissions import (
     HasInventoryAccess, HasControlPanelAccess
 )
+from apps.insurance.cache import ALL_BRANCHES, get_subscribers_revision
 from apps.insurance.models import InsuranceSubscriber
 from apps.insurance.serializers import InsuranceSubscriberSerializer
 
 
 logger = logging.getLogger(__name__)
 
+
+class InsuranceSubscriberPagination(KeysetPagination):
+    """Cursor pages ordered by subscriber code, with the primary key breaking ties between equal codes."""
+    ordering = ('subscriber_code', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        # `?ordering=` and the view's ordering replace ours; keep the cursor stable for them too.
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if 'id' not in ordering and '-id' not in ordering:
+            ordering += ('id',)
+        return ordering
+
+
 class InsuranceSubscriberViewSet(BaseViewSet):
-    """ViewSet for InsuranceSubscriber model."""
+    """
+    ViewSet for InsuranceSubscriber model.
+
+    The list is cursor paginated: responses carry ``next``, ``previous`` and
+    ``results`` only, with no ``count``, and clients follow the ``next``/
+    ``previous`` URLs (``?cursor=``) instead of passing ``?page=N``.
+    ``page_size`` is still accepted.
+    """
     
     queryset = InsuranceSubscriber.objects.all()
     serializer_class = InsuranceSubscriberSerializer
     filterset_fields = ['branch', 'subscriber_code', 'subscriber_name', 'insurance_company', 'is_active']
     search_fields = ['subscriber_code', 'subscriber_name', 'insurance_company']
     ordering_fields = ['subscriber_code', 'subscriber_name']
-    ordering = ['subscriber_code']
+    ordering = ['subscriber_code', 'id']
+    pagination_class = InsuranceSubscriberPagination
+    list_cache_timeout = 300
     
     permission_classes_by_action = {
         'create': [HasInventoryAccess],
@@ -34,8 +60,27 @@ class InsuranceSubscriberViewSet(BaseViewSet):
         queryset = super().get_queryset()
         
         if not self.request.user.is_superuser:
-            user_branch = getattr(self.request.user, 'default_branch', None)
-            if user_branch:
-                queryset = queryset.filter(branch=user_branch)
+            # The FK id is already on the user row; no Branch fetch needed.
+            user_branch_id = getattr(self.request.user, 'default_branch_id', None)
+            if user_branch_id:
+                queryset = queryset.filter(branch_id=user_branch_id)
         
         return queryset
+
+    def get_list_scope(self):
+        """The branch whose subscribers this user lists, or ALL_BRANCHES when unfiltered."""
+        if self.request.user.is_superuser:
+            return ALL_BRANCHES
+        return getattr(self.request.user, 'default_branch_id', None) or ALL_BRANCHES
+
+    def list(self, request, *args, **kwargs):
+        """Serve list pages from the cache until a subscriber of the branch changes."""
+        scope = self.get_list_scope()
+        path = hashlib.blake2b(request.get_full_path().encode(), digest_size=8).hexdigest()
+        key = f"isub:list:{scope}:v{get_subscribers_revision(scope)}:{path}"
+        data = cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(key, response.data, self.list_cache_timeout)
+            return response
+        return Response(data)
@@ -1,14 +1,26 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from apps.core_apps.general import EstimatedCountPaginator
+from apps.core_apps.indexing import queue_reindex
 from .models import (
     StoreGroup, ItemGroup, Item, ItemUnit, ItemBarcode, InventoryBalance
 )
 
+
+def is_changelist_request(request, model):
+    """Whether the admin request is rendering the model's changelist rather than a single object."""
+    match = request.resolver_match
+    opts = model._meta
+    return match is not None and match.url_name == f'{opts.app_label}_{opts.model_name}_changelist'
+
+
 @admin.register(StoreGroup)
 class StoreGroupAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'branch', 'cost_method', 'created_by', 'created_at')
     list_filter = ('branch', 'cost_method')
     search_fields = ('code', 'name', 'slug')
+    autocomplete_fields = ('branch', 'stock_account', 'sales_account', 'cost_of_sales_account')
     prepopulated_fields = {'slug': ('name',)}
     ordering = ('branch', 'code')
     fieldsets = (
@@ -20,12 +32,14 @@ class StoreGroupAdmin(admin.ModelAdmin):
         }),
     )
     readonly_fields = ('created_by', 'updated_by', 'created_at', 'updated_at')
+    list_select_related = ('branch__company', 'created_by')
 
 @admin.register(ItemGroup)
 class ItemGroupAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'store_group', 'parent', 'group_type', 'is_featured', 'visibility', 'created_at')
     list_filter = ('store_group', 'group_type', 'is_featured', 'visibility')
     search_fields = ('code', 'name', 'slug')
+    autocomplete_fields = ('branch', 'store_group', 'parent')
     prepopulated_fields = {'slug': ('name',)}
     ordering = ('store_group', 'code')
     fieldsets = (
@@ -43,15 +57,42 @@ class ItemGroupAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('store_group', 'branch', 'parent')
+        return qs.select_related('store_group', 'branch', 'parent__store_group')
+
+class ItemUnitInline(admin.TabularInline):
+    model = ItemUnit
+    extra = 1
+    fields = ('code', 'name', 'conversion_factor', 'unit_price', 'unit_cost', 'is_default', 'is_active')
+
+    def get_queryset(self, request):
+        # The form columns plus what ItemUnit.__str__ reads for each row's label.
+        return super().get_queryset(request).select_related('item').only(
+            *self.fields, 'item__code', 'created_by', 'updated_by', 'created_at', 'updated_at',
+        )
+
+class ItemBarcodeInline(admin.TabularInline):
+    model = ItemBarcode
+    extra = 1
+    fields = ('barcode', 'barcode_type', 'unit', 'is_primary', 'is_active')
+    autocomplete_fields = ('unit',)
+
+    def get_queryset(self, request):
+        # The form columns plus the item codes read by __str__ and ItemBarcode.clean().
+        return super().get_queryset(request).select_related('item', 'unit__item').only(
+            'barcode', 'barcode_type', 'is_primary', 'is_active', 'item__code', 'unit__code', 'unit__item__code',
+            'created_by', 'updated_by', 'created_at', 'updated_at',
+        )
 
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'item_group', 'item_type', 'sales_price', 'standard_cost', 'is_featured', 'visibility', 'created_at')
     list_filter = ('item_group', 'item_type', 'is_featured', 'visibility', 'is_service_item', 'track_expiry', 'track_batches')
     search_fields = ('code', 'name', 'slug', 'manufacturer', 'brand', 'tags')
+    autocomplete_fields = ('branch', 'item_group')
     prepopulated_fields = {'slug': ('name',)}
     ordering = ('item_group', 'code')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         (_('Basic Information'), {
             'fields': ('branch', 'item_group', 'code', 'name', 'slug', 'item_type', 'base_unit')
@@ -75,18 +116,80 @@ class ItemAdmin(admin.ModelAdmin):
         }),
     )
     readonly_fields = ('average_rating', 'review_count', 'created_by', 'updated_by', 'created_at', 'updated_at')
-    inlines = []  # Can add inlines for units, barcodes if needed
+    inlines = [ItemUnitInline, ItemBarcodeInline]
+    inline_batch_size = 1000
+    # Columns read by list_display, including what ItemGroup.__str__ walks.
+    changelist_only_fields = (
+        'id', 'code', 'name', 'item_type', 'sales_price', 'standard_cost', 'is_featured', 'visibility',
+        'created_at', 'item_group__code', 'item_group__name', 'item_group__store_group__code',
+    )
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
+        if is_changelist_request(request, self.model):
+            return qs.select_related(None).select_related('item_group__store_group').only(*self.changelist_only_fields)
         return qs.select_related('item_group__store_group', 'branch')
 
+    def save_formset(self, request, form, formset, change):
+        """Write inline units and barcodes with one bulk INSERT and one bulk UPDATE instead of a query per row."""
+        instances = formset.save(commit=False)
+        for obj in formset.deleted_objects:
+            obj.delete()
+
+        now = timezone.now()
+        new_objects = []
+        for obj in instances:
+            obj.updated_by = request.user
+            obj.updated_at = now
+            if obj._state.adding:
+                obj.created_by = request.user
+                # bulk_create bypasses save(), so generate codes the way CodeGenerationMixin would.
+                if hasattr(obj, 'code') and not obj.code:
+                    obj.code = obj.generate_code()
+                new_objects.append(obj)
+
+        if formset.model is ItemUnit:
+            self._clear_replaced_default_units(form.instance, instances)
+
+        # Existing rows first: the old default is already cleared, so no statement
+        # ever holds two defaults for uniq_default_item_unit to reject.
+        if formset.changed_objects:
+            fields = {name for _, changed in formset.changed_objects for name in changed}
+            fields.update({'updated_by', 'updated_at'})
+            formset.model.objects.bulk_update(
+                [obj for obj, _ in formset.changed_objects], fields=list(fields), batch_size=self.inline_batch_size
+            )
+        if new_objects:
+            formset.model.objects.bulk_create(new_objects, batch_size=self.inline_batch_size)
+        formset.save_m2m()
+        # The bulk writes send no post_save, so queue the Algolia sync here.
+        for obj in instances:
+            queue_reindex(obj, obj._state.db)
+
+    def _clear_replaced_default_units(self, item, units):
+        """Do what ItemUnit.save() does for the bulk path: one default unit per item, the last one ticked."""
+        defaults = [unit for unit in units if unit.is_default]
+        if not defaults:
+            return
+        new_default = defaults[-1]
+        for unit in defaults[:-1]:
+            unit.is_default = False
+        replaced = ItemUnit.objects.filter(item=item, is_default=True).exclude(pk=new_default.pk)
+        replaced_pks = list(replaced.values_list('pk', flat=True))
+        if replaced_pks:
+            ItemUnit.objects.filter(pk__in=replaced_pks).update(is_default=False, updated_at=timezone.now())
+            for pk in replaced_pks:
+                queue_reindex(ItemUnit(pk=pk), ItemUnit.objects.db)
+
 @admin.register(ItemUnit)
 class ItemUnitAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'item', 'conversion_factor', 'unit_price', 'is_default', 'created_at')
     list_filter = ('is_default', 'is_purchase_unit', 'is_sales_unit')
     search_fields = ('code', 'name', 'item__code', 'item__name')
+    autocomplete_fields = ('item',)
     ordering = ('item', 'code')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         (_('Basic Information'), {
             'fields': ('item', 'code', 'name', 'conversion_factor')
@@ -99,26 +202,34 @@ class ItemUnitAdmin(admin.ModelAdmin):
         }),
     )
     readonly_fields = ('created_by', 'updated_by', 'created_at', 'updated_at')
+    list_select_related = ('item__item_group__store_group',)
 
 @admin.register(ItemBarcode)
 class ItemBarcodeAdmin(admin.ModelAdmin):
     list_display = ('barcode', 'barcode_type', 'item', 'unit', 'is_primary', 'created_at')
     list_filter = ('barcode_type', 'is_primary')
     search_fields = ('barcode', 'item__code', 'item__name')
+    autocomplete_fields = ('item', 'unit')
     ordering = ('item', 'barcode')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         (_('Basic Information'), {
             'fields': ('item', 'barcode', 'barcode_type', 'unit', 'is_primary')
         }),
     )
     readonly_fields = ('created_by', 'updated_by', 'created_at', 'updated_at')
+    list_select_related = ('item__item_group__store_group', 'unit__item')
 
 @admin.register(InventoryBalance)
 class InventoryBalanceAdmin(admin.ModelAdmin):
     list_display = ('item', 'branch', 'location', 'batch_number', 'expiry_date', 'available_quantity', 'reserved_quantity', 'average_cost', 'last_movement_date')
     list_filter = ('branch',)
     search_fields = ('item__code', 'item__name', 'batch_number', 'location')
+    autocomplete_fields = ('branch', 'item')
     ordering = ('-last_movement_date',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     fieldsets = (
         (_('Basic Information'), {
             'fields': ('branch', 'item', 'location', 'batch_number', 'expiry_date')
@@ -128,7 +239,16 @@ class InventoryBalanceAdmin(admin.ModelAdmin):
         }),
     )
     readonly_fields = ('last_movement_date', 'created_by', 'updated_by', 'created_at', 'updated_at')
+    # Columns read by list_display, including what Item.__str__ and Branch.__str__ walk.
+    changelist_only_fields = (
+        'id', 'location', 'batch_number', 'expiry_date', 'available_quantity', 'reserved_quantity',
+        'average_cost', 'last_movement_date', 'item__code', 'item__name', 'item__item_group__store_group__code',
+        'branch__code', 'branch__branch_name', 'branch__company__company_name',
+    )
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.select_related('item__item_group__store_group', 'branch')
\ No newline at end of file
+        qs = qs.select_related('item__item_group__store_group', 'branch__company')
+        if is_changelist_request(request, self.model):
+            qs = qs.only(*self.changelist_only_fields)
+        return qs
\ No newline at end of file
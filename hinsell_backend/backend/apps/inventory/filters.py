@@ -0,0 +1,12 @@
+import django_filters
+from apps.inventory.models import Item
+
+class ItemFilter(django_filters.FilterSet):
+    low_stock = django_filters.BooleanFilter(field_name='low_stock')
+
+    class Meta:
+        model = Item
+        fields = [
+            'branch', 'item_group', 'code', 'item_type', 'is_featured', 'visibility',
+            'track_expiry', 'track_batches'
+        ]
@@ -1,132 +1,169 @@
-# import uuid
-# from algoliasearch_django import AlgoliaIndex
-# from algoliasearch_django.decorators import register
-# from apps.inventory.models import ItemGroup, Item, ItemUnit, ItemBarcode
+from algoliasearch_django import AlgoliaIndex
+from algoliasearch_django.decorators import register
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import CharField, OuterRef, Subquery
+from django.db.models.expressions import RawSQL
+from apps.core_apps import search  # noqa: F401 -- installs the shared record serializer
+from apps.inventory.models import ItemGroup, Item, ItemUnit, ItemBarcode
+from apps.shared.models import Media
 
+MEDIA_STORAGE = Media._meta.get_field('file').storage
 
-# def item_group_is_indexable(self):
-#     return self.visibility != 'hidden'
-# ItemGroup.is_indexable = item_group_is_indexable
 
-# def item_is_indexable(self):
-#     return self.visibility != 'hidden'
-# Item.is_indexable = item_is_indexable
+def category_names(group_column):
+    """
+    Annotation with the names of an item group and its ancestors, root first.
 
-# def serialize_record(record):
-#     """Recursively convert UUIDs to strings and related objects to IDs."""
-#     if isinstance(record, dict):
-#         return {k: serialize_record(v) for k, v in record.items()}
-#     elif isinstance(record, list):
-#         return [serialize_record(v) for v in record]
-#     elif isinstance(record, uuid.UUID):
-#         return str(record)
-#     # Convert Django model instances to their primary key
-#     elif hasattr(record, "pk"):
-#         return serialize_record(record.pk)
-#     return record
+    A correlated recursive CTE walks the parent chain inside the same query,
+    so a reindex does not issue one SELECT per level per record.
+    """
+    table = ItemGroup._meta.db_table
+    return RawSQL(
+        f"""(WITH RECURSIVE ancestors(id, parent_id, name, depth, visited) AS (
+            SELECT g.id, g.parent_id, g.name, 0, ARRAY[g.id] FROM {table} g WHERE g.id = {group_column}
+            UNION ALL
+            SELECT p.id, p.parent_id, p.name, a.depth + 1, a.visited || p.id
+            FROM {table} p JOIN ancestors a ON p.id = a.parent_id
+            WHERE p.id <> ALL(a.visited)
+        ) SELECT array_agg(name ORDER BY depth DESC) FROM ancestors)""",
+        (),
+        output_field=ArrayField(CharField()),
+    )
 
-# @register(ItemGroup)
-# class ItemGroupIndex(AlgoliaIndex):
-#     fields = ('id', 'code', 'name', 'slug', 'visibility', 'group_type', 'description',
-#               'is_featured')
-#     should_index = 'is_indexable'
-#     settings = {
-#         'searchableAttributes': ['name', 'code', 'description'],
-#         'attributesForFaceting': ['visibility', 'group_type', 'is_featured', 'filterOnly(store_group_id)'],
-#         'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
-#     }
-#     def category_path(self, obj):
-#         path = []
-#         current = obj
-#         while current:
-#             path.append(current.name)
-#             current = current.parent
-#         path.reverse()
-#         return ' > '.join(path)
-#     def store_group_id(self, obj):
-#         return obj.store_group.id
-#     def parent_id(self, obj):
-#         return obj.parent.id if obj.parent else None
-#     def get_raw_record(self, obj):
-#         record = super().get_raw_record(obj)
-#         record['category_path'] = self.category_path(obj)
-#         record['store_group_id'] = self.store_group_id(obj)
-#         record['parent_id'] = self.parent_id(obj)
-#         return serialize_record(record)
 
-# @register(Item)
-# class ItemIndex(AlgoliaIndex):
-#     fields = ('id', 'code', 'name', 'slug', 'size', 'color', 'sales_price', 'item_type',
-#               'visibility', 'is_featured', 'brand', 'manufacturer', 'description',
-#               'short_description', 'average_rating')
-#     should_index = 'is_indexable'
-#     settings = {
-#         'searchableAttributes': ['name', 'code', 'description', 'short_description', 'brand', 'manufacturer', 'tags'],
-#         'attributesForFaceting': ['item_type', 'visibility', 'brand', 'manufacturer', 'size', 'color',
-#                                   'hierarchical_categories.lvl0', 'hierarchical_categories.lvl1',
-#                                   'hierarchical_categories.lvl2', 'hierarchical_categories.lvl3',
-#                                   'filterOnly(sales_price)', 'filterOnly(average_rating)'],
-#         'ranking': ['desc(average_rating)', 'asc(sales_price)', 'typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
-#     }
-#     def get_tags(self, obj):
-#         if obj.tags:
-#             return [t.strip() for t in obj.tags.split(',') if t.strip()]
-#         return []
-#     def item_group_id(self, obj):
-#         return obj.item_group.id
-#     def hierarchical_categories(self, obj):
-#         path = []
-#         current = obj.item_group
-#         while current:
-#             path.append(current.name)
-#             current = current.parent
-#         path.reverse()
-#         levels = {}
-#         for i in range(len(path)):
-#             levels[f'lvl{i}'] = ' > '.join(path[:i+1])
-#         return levels
-#     def image_url(self, obj):
-#         if obj.media.exists():
-#             return obj.media.first().file.url
-#         return None
-#     def get_raw_record(self, obj):
-#         record = super().get_raw_record(obj)
-#         record['tags'] = self.get_tags(obj)
-#         record['item_group_id'] = self.item_group_id(obj)
-#         record['hierarchical_categories'] = self.hierarchical_categories(obj)
-#         record['image_url'] = self.image_url(obj)
-#         return serialize_record(record)
+def group_path(group):
+    """Names from the root group down to `group`, loading parents one by one."""
+    path = []
+    seen = set()
+    current = group
+    while current and current.pk not in seen:
+        seen.add(current.pk)
+        path.append(current.name)
+        current = current.parent
+    path.reverse()
+    return path
 
-# @register(ItemUnit)
-# class ItemUnitIndex(AlgoliaIndex):
-#     fields = ('id', 'name', 'code', 'unit_cost', 'conversion_factor',
-#               'is_default', 'is_purchase_unit', 'is_sales_unit')
-#     settings = {
-#         'searchableAttributes': ['name', 'code'],
-#         'attributesForFaceting': ['item_id', 'is_default'],
-#         'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
-#     }
-#     def item_id(self, obj):
-#         return obj.item.id
-#     def get_raw_record(self, obj):
-#         record = super().get_raw_record(obj)
-#         record['item_id'] = self.item_id(obj)
-#         return serialize_record(record)
 
-# @register(ItemBarcode)
-# class ItemBarcodeIndex(AlgoliaIndex):
-#     fields = ('id', 'barcode', 'barcode_type', 'is_primary')
-#     settings = {
-#         'searchableAttributes': ['barcode'],
-#         'attributesForFaceting': ['barcode_type', 'is_primary', 'item_id'],
-#         'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
-#     }
-#     def item_id(self, obj):
-#         return obj.item.id
-#     def unit_id(self, obj):
-#         return obj.unit.id if obj.unit else None
-#     def get_raw_record(self, obj):
-#         record = super().get_raw_record(obj)
-#         record['item_id'] = self.item_id(obj)
-#         record['unit_id'] = self.unit_id(obj)
-#         return serialize_record(record)
\ No newline at end of file
+def item_group_is_indexable(self):
+    return self.visibility != 'hidden'
+ItemGroup.is_indexable = item_group_is_indexable
+
+def item_is_indexable(self):
+    return self.visibility != 'hidden'
+Item.is_indexable = item_is_indexable
+
+@register(ItemGroup)
+class ItemGroupIndex(AlgoliaIndex):
+    fields = ('id', 'code', 'name', 'slug', 'visibility', 'group_type', 'description',
+              'is_featured')
+    should_index = 'is_indexable'
+    settings = {
+        'searchableAttributes': ['name', 'code', 'description'],
+        'attributesForFaceting': ['visibility', 'group_type', 'is_featured', 'filterOnly(store_group_id)'],
+        'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
+    }
+    def get_queryset(self):
+        table = ItemGroup._meta.db_table
+        return ItemGroup.objects.only(*self.fields, 'store_group_id', 'parent_id').annotate(
+            category_names=category_names(f'"{table}"."id"')
+        )
+    def category_path(self, obj):
+        path = getattr(obj, 'category_names', None)
+        if path is None:
+            path = group_path(obj)
+        return ' > '.join(path)
+    def store_group_id(self, obj):
+        return obj.store_group_id
+    def parent_id(self, obj):
+        return obj.parent_id
+    def get_raw_record(self, obj):
+        record = super().get_raw_record(obj)
+        record['category_path'] = self.category_path(obj)
+        record['store_group_id'] = self.store_group_id(obj)
+        record['parent_id'] = self.parent_id(obj)
+        return record
+
+@register(Item)
+class ItemIndex(AlgoliaIndex):
+    fields = ('id', 'code', 'name', 'slug', 'size', 'color', 'sales_price', 'item_type',
+              'visibility', 'is_featured', 'brand', 'manufacturer', 'description',
+              'short_description', 'average_rating')
+    should_index = 'is_indexable'
+    settings = {
+        'searchableAttributes': ['name', 'code', 'description', 'short_description', 'brand', 'manufacturer', 'tags'],
+        'attributesForFaceting': ['item_type', 'visibility', 'brand', 'manufacturer', 'size', 'color',
+                                  'hierarchical_categories.lvl0', 'hierarchical_categories.lvl1',
+                                  'hierarchical_categories.lvl2', 'hierarchical_categories.lvl3',
+                                  'filterOnly(sales_price)', 'filterOnly(average_rating)'],
+        'ranking': ['desc(average_rating)', 'asc(sales_price)', 'typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
+    }
+    def get_queryset(self):
+        table = Item._meta.db_table
+        # Only what the record and should_index read; the long content columns stay in Postgres.
+        return Item.objects.select_related(None).only(*self.fields, 'tags', 'tag_list', 'item_group_id').annotate(
+            category_names=category_names(f'"{table}"."item_group_id"'),
+            first_media_file=Subquery(
+                Media.objects.filter(items=OuterRef('pk')).order_by('display_order').values('file')[:1]
+            ),
+        )
+    def get_tags(self, obj):
+        if obj.tag_list or not obj.tags:
+            return obj.tag_list
+        # Rows not saved since tag_list was added.
+        return Item.parse_tags(obj.tags)
+    def item_group_id(self, obj):
+        return obj.item_group_id
+    def hierarchical_categories(self, obj):
+        path = getattr(obj, 'category_names', None)
+        if path is None:
+            path = group_path(obj.item_group)
+        levels = {}
+        for i in range(len(path)):
+            levels[f'lvl{i}'] = ' > '.join(path[:i+1])
+        return levels
+    def image_url(self, obj):
+        if hasattr(obj, 'first_media_file'):
+            return MEDIA_STORAGE.url(obj.first_media_file) if obj.first_media_file else None
+        media = obj.media.first()
+        return media.file.url if media else None
+    def get_raw_record(self, obj):
+        record = super().get_raw_record(obj)
+        record['tags'] = self.get_tags(obj)
+        record['item_group_id'] = self.item_group_id(obj)
+        record['hierarchical_categories'] = self.hierarchical_categories(obj)
+        record['image_url'] = self.image_url(obj)
+        return record
+
+@register(ItemUnit)
+class ItemUnitIndex(AlgoliaIndex):
+    fields = ('id', 'name', 'code', 'unit_cost', 'conversion_factor',
+              'is_default', 'is_purchase_unit', 'is_sales_unit')
+    settings = {
+        'searchableAttributes': ['name', 'code'],
+        'attributesForFaceting': ['item_id', 'is_default'],
+        'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
+    }
+    def item_id(self, obj):
+        return obj.item_id
+    def get_raw_record(self, obj):
+        record = super().get_raw_record(obj)
+        record['item_id'] = self.item_id(obj)
+        return record
+
+@register(ItemBarcode)
+class ItemBarcodeIndex(AlgoliaIndex):
+    fields = ('id', 'barcode', 'barcode_type', 'is_primary')
+    settings = {
+        'searchableAttributes': ['barcode'],
+        'attributesForFaceting': ['barcode_type', 'is_primary', 'item_id'],
+        'ranking': ['typo', 'geo', 'words', 'filters', 'proximity', 'attribute', 'exact', 'custom']
+    }
+    def item_id(self, obj):
+        return obj.item_id
+    def unit_id(self, obj):
+        return obj.unit_id
+    def get_raw_record(self, obj):
+        record = super().get_raw_record(obj)
+        record['item_id'] = self.item_id(obj)
+        record['unit_id'] = self.unit_id(obj)
+        return record
\ No newline at end of file
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.inventory.models import ItemGroup, StoreGroup
+from apps.core_apps.utils import Logger
+
+logger = Logger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored full_code and level of every item group from its store group and parents'
+
+    def handle(self, *args, **options):
+        groups = ItemGroup._meta.db_table
+        store_groups = StoreGroup._meta.db_table
+        # Walks down from the roots, so each child builds on its parent's fresh path.
+        # Groups caught in a parent cycle are never reached and keep their old value.
+        sql = f"""
+            WITH RECURSIVE tree(id, full_code, level) AS (
+                SELECT g.id, s.code || '.' || g.code, 0
+                FROM {groups} g JOIN {store_groups} s ON s.id = g.store_group_id
+                WHERE g.parent_id IS NULL
+                UNION ALL
+                SELECT c.id, t.full_code || '.' || c.code, t.level + 1
+                FROM {groups} c JOIN tree t ON c.parent_id = t.id
+            )
+            UPDATE {groups} g SET full_code = tree.full_code, level = tree.level
+            FROM tree WHERE g.id = tree.id
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql)
+            updated = cursor.rowcount
+        unreachable = ItemGroup.all_objects.count() - updated
+        logger.info("Rebuilt item group paths", extra={'updated': updated, 'unreachable': unreachable})
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt paths for {updated} item groups.'))
+        if unreachable:
+            self.stdout.write(self.style.WARNING(
+                f'{unreachable} item groups are not under a root group (parent cycle) and were left unchanged.'
+            ))
@@ -1,10 +1,13 @@
-from django.db import models, IntegrityError
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, IntegrityError, transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from decimal import Decimal
-from apps.core_apps.general import AuditableModel
+from apps.core_apps.general import AuditableModel, TimestampedModelManager
 from apps.core_apps.validators import validate_positive_decimal, validate_percentage
 from apps.organization.models import Branch
 from apps.accounting.models import Account
@@ -78,12 +81,32 @@ class StoreGroup(AuditableModel):
             models.Index(fields=['branch', 'code']),
             models.Index(fields=['slug']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(name__regex=r'^\s*$'),
+                name='nonblank_store_group_name',
+                violation_error_message=_('Name cannot be empty.')
+            )
+        ]
 
     def clean(self):
         super().clean()
         if not self.name.strip():
             raise ValidationError({'name': _('Name cannot be empty.')})
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        old_code = None
+        if not self._state.adding and (update_fields is None or 'code' in update_fields):
+            old_code = StoreGroup.all_objects.filter(pk=self.pk).values_list('code', flat=True).first()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_code and old_code != self.code:
+                # Every stored group path in this store group starts with its code.
+                ItemGroup.all_objects.filter(store_group=self, full_code__startswith=f"{old_code}.").update(
+                    full_code=ItemGroup.replace_prefix(old_code, self.code)
+                )
+
     def __str__(self):
         return f"{self.code} - {self.name} ({self.branch.branch_name})"
 
@@ -129,6 +152,18 @@ class ItemGroup(AuditableModel):
         related_name='children',
         verbose_name=_("Parent Group")
     )
+    full_code = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name=_("Full Code")
+    )
+    level = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_("Level")
+    )
     group_type = models.CharField(
         max_length=10,
         choices=GroupType.choices,
@@ -175,8 +210,16 @@ class ItemGroup(AuditableModel):
         verbose_name_plural = _("Item Groups")
         indexes = [
             models.Index(fields=['branch', 'store_group', 'code']),
+            models.Index(fields=['store_group', 'code']),
             models.Index(fields=['slug', 'is_featured', 'visibility']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(name__regex=r'^\s*$'),
+                name='nonblank_item_group_name',
+                violation_error_message=_('Name cannot be empty.')
+            )
+        ]
 
     def clean(self):
         super().clean()
@@ -184,23 +227,122 @@ class ItemGroup(AuditableModel):
             raise ValidationError({'name': _('Name cannot be empty.')})
         if self.parent and self.parent.store_group != self.store_group:
             raise ValidationError({'parent': _('Parent group must belong to the same store group.')})
+        if self.parent_id and not self._state.adding and (
+            self.parent_id == self.pk or self.parent.is_descendant_of(self)
+        ):
+            raise ValidationError({'parent': _('Circular parent relationship detected.')})
 
-    def get_full_code(self) -> str:
-        if self.parent:
+    def is_descendant_of(self, group) -> bool:
+        """Whether ``group`` is an ancestor of this group."""
+        if self.full_code and group.full_code:
+            # The stored path lists every ancestor, so no walk up the tree is needed.
+            return self.full_code.startswith(f"{group.full_code}.")
+        # Paths not backfilled yet: walk the parents, stopping if the chain already loops.
+        seen = set()
+        current = self
+        while current.parent_id and current.parent_id not in seen:
+            if current.parent_id == group.pk:
+                return True
+            seen.add(current.parent_id)
+            current = current.parent
+        return False
+
+    PATH_FIELDS = frozenset({'code', 'parent', 'parent_id', 'store_group', 'store_group_id'})
+
+    @staticmethod
+    def replace_prefix(old_prefix: str, new_prefix: str):
+        """Expression rewriting the leading `old_prefix` of full_code in an UPDATE."""
+        return Concat(
+            models.Value(new_prefix),
+            Substr('full_code', len(old_prefix) + 1),
+            output_field=models.CharField()
+        )
+
+    def build_full_code(self) -> str:
+        if self.parent_id:
             return f"{self.parent.get_full_code()}.{self.code}"
         return f"{self.store_group.code}.{self.code}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not self.PATH_FIELDS.intersection(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        if not self.code:
+            self.code = self.generate_code()
+        old_full_code, old_level = None, self.level
+        if not self._state.adding:
+            old_full_code, old_level = ItemGroup.all_objects.filter(pk=self.pk).values_list(
+                'full_code', 'level'
+            ).first() or (None, self.level)
+        self.full_code = self.build_full_code()
+        self.level = self.parent.get_level() + 1 if self.parent_id else 0
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'full_code', 'level'}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_full_code and old_full_code != self.full_code:
+                # Re-root the whole subtree in one statement instead of saving each descendant.
+                ItemGroup.all_objects.filter(full_code__startswith=f"{old_full_code}.").update(
+                    full_code=self.replace_prefix(old_full_code, self.full_code),
+                    level=models.F('level') + (self.level - old_level)
+                )
+
+    def get_full_code(self) -> str:
+        # Rows saved before the column existed stay empty until `rebuild_item_group_paths` runs.
+        return self.full_code or self.build_full_code()
+
     def get_level(self) -> int:
-        level = 0
-        current = self.parent
-        while current:
-            level += 1
-            current = current.parent
-        return level
+        # level is only trustworthy on rows whose path has been stored.
+        if self.full_code or not self.parent_id:
+            return self.level
+        return self.parent.get_level() + 1
 
     def __str__(self):
         return f"{self.store_group.code} - {self.code} - {self.name}"
 
+class ItemQuerySet(models.QuerySet):
+    def with_current_stock(self):
+        """Annotate ``current_stock`` so ``get_current_stock`` needs no query per item."""
+        stock = InventoryBalance.objects.filter(item=OuterRef('pk')).order_by().values('item').annotate(
+            total=Sum('available_quantity')
+        ).values('total')
+        return self.annotate(current_stock=Coalesce(
+            Subquery(stock),
+            models.Value(Decimal('0.0000')),
+            output_field=models.DecimalField(max_digits=18, decimal_places=8)
+        ))
+
+    def with_low_stock_flag(self):
+        """Annotate ``current_stock`` and a ``low_stock`` flag matching ``Item.is_low_stock``."""
+        return self.with_current_stock().annotate(low_stock=models.Case(
+            models.When(reorder_level__gt=0, current_stock__lte=models.F('reorder_level'), then=models.Value(True)),
+            default=models.Value(False),
+            output_field=models.BooleanField()
+        ))
+
+    def with_units_and_barcodes(self):
+        """Prefetch the columns ``ItemSerializer`` renders for units and barcodes."""
+        # item_id stays in both column lists so the prefetch can match rows to their item.
+        return self.prefetch_related(
+            models.Prefetch('units', queryset=ItemUnit.objects.select_related(None).only(
+                'id', 'item_id', 'code', 'name', 'conversion_factor', 'unit_price', 'unit_cost',
+                'is_default', 'is_purchase_unit', 'is_sales_unit', 'created_at', 'updated_at'
+            ).order_by('-is_default', 'code')),
+            models.Prefetch('barcodes', queryset=ItemBarcode.objects.only(
+                'id', 'item_id', 'unit_id', 'barcode', 'barcode_type', 'is_primary', 'created_at', 'updated_at'
+            )),
+        )
+
+
+class ItemManager(TimestampedModelManager.from_queryset(ItemQuerySet)):
+    def get_queryset(self):
+        # __str__ and the notification helpers read these on every row.
+        return super().get_queryset().select_related('branch', 'item_group__store_group')
+
+
 class Item(AuditableModel):
     """Item master data with e-commerce and pharmaceutical features."""
     class ItemType(models.TextChoices):
@@ -212,12 +354,14 @@ class Item(AuditableModel):
         Branch,
         on_delete=models.CASCADE,
         related_name='items',
+        db_index=False,
         verbose_name=_("Branch")
     )
     item_group = models.ForeignKey(
         ItemGroup,
         on_delete=models.CASCADE,
         related_name='items',
+        db_index=False,
         verbose_name=_("Item Group")
     )
     code = models.CharField(
@@ -345,6 +489,14 @@ class Item(AuditableModel):
         blank=True,
         verbose_name=_("Tags")
     )
+    tag_list = ArrayField(
+        models.CharField(max_length=255),
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name=_("Tag List"),
+        help_text=_("Parsed from tags on save so indexing can read it directly")
+    )
     average_rating = models.DecimalField(
         max_digits=3,
         decimal_places=2,
@@ -464,12 +616,15 @@ class Item(AuditableModel):
         verbose_name=_("Internal Notes")
     )
 
+    objects = ItemManager()
+
     class Meta:
         verbose_name = _("Item")
         verbose_name_plural = _("Items")
         indexes = [
-            models.Index(fields=['branch', 'code']),
+            models.Index(fields=['branch', 'is_active', 'item_group']),
             models.Index(fields=['item_group', 'slug']),
+            models.Index(fields=['item_group', 'code']),
             models.Index(fields=['is_featured', 'visibility', 'average_rating']),
             models.Index(fields=['manufacturer', 'brand']),
             models.Index(fields=['size', 'color']),
@@ -498,6 +653,16 @@ class Item(AuditableModel):
             models.CheckConstraint(
                 check=models.Q(average_rating__gte=0) & models.Q(average_rating__lte=5),
                 name='valid_average_rating'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(name__regex=r'^\s*$'),
+                name='nonblank_item_name',
+                violation_error_message=_('Name cannot be empty.')
+            ),
+            models.CheckConstraint(
+                check=~models.Q(base_unit__regex=r'^\s*$'),
+                name='nonblank_item_base_unit',
+                violation_error_message=_('Base unit cannot be empty.')
             )
         ]
 
@@ -517,6 +682,17 @@ class Item(AuditableModel):
         if self.reorder_level > 0 and self.maximum_stock > 0 and self.reorder_level >= self.maximum_stock:
             raise ValidationError({'maximum_stock': _('Maximum stock must be greater than reorder level.')})
 
+    @staticmethod
+    def parse_tags(tags: str) -> list:
+        return [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else []
+
+    def save(self, *args, **kwargs):
+        self.tag_list = self.parse_tags(self.tags)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tags' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'tag_list'}
+        super().save(*args, **kwargs)
+
     def calculate_selling_price(self, cost: Decimal = None) -> Decimal:
         cost = cost or self.standard_cost
         if cost > 0 and self.markup_percentage > 0:
@@ -530,6 +706,9 @@ class Item(AuditableModel):
         return self.sales_price
 
     def get_current_stock(self) -> Decimal:
+        current_stock = self.__dict__.get('current_stock')
+        if current_stock is not None:
+            return current_stock
         balance = InventoryBalance.objects.filter(
             item=self
         ).aggregate(
@@ -538,7 +717,7 @@ class Item(AuditableModel):
         return balance or Decimal('0.0000')
 
     def is_low_stock(self) -> bool:
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         if self.reorder_level > 0:
             current_stock = self.get_current_stock()
             if current_stock <= self.reorder_level:
@@ -551,7 +730,7 @@ class Item(AuditableModel):
     def notify_low_stock(self, current_stock: Decimal):
         """Send notification for low stock."""
         from apps.core_apps.services.messaging_service import MessagingService
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         try:
             service = MessagingService(self.branch)
             service.send_notification(
@@ -577,7 +756,7 @@ class Item(AuditableModel):
         return self.name
 
     def update_rating(self, new_rating: Decimal) -> None:
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         if not (0 <= new_rating <= 5):
             raise ValidationError(_('Rating must be between 0 and 5.'))
         total_ratings = self.review_count + 1
@@ -592,6 +771,47 @@ class Item(AuditableModel):
     def __str__(self):
         return f"{self.item_group.store_group.code} - {self.code} - {self.name}"
 
+class ItemUnitManager(TimestampedModelManager):
+    UPSERT_FIELDS = [
+        'name', 'conversion_factor', 'unit_price', 'unit_cost', 'is_default',
+        'is_purchase_unit', 'is_sales_unit', 'is_active', 'is_deleted', 'deleted_at',
+        'updated_at', 'updated_by',
+    ]
+
+    def get_queryset(self):
+        # ItemUnit.__str__ reads the item code.
+        return super().get_queryset().select_related('item')
+
+    def bulk_replace(self, item, units):
+        """
+        Make ``units`` the item's live units in a fixed number of queries.
+
+        Units are upserted on (item, code) and any other unit of the item is
+        soft deleted. This bypasses ``ItemUnit.save()`` and its signals, so
+        codes are generated here, audit users are not stamped and the Algolia
+        index has to be refreshed by the caller.
+        """
+        units = list(units)
+        for unit in units:
+            unit.item = item
+            unit.is_deleted, unit.deleted_at = False, None
+            if not unit.code:
+                unit.code = unit.generate_code()
+        now = timezone.now()
+        with transaction.atomic():
+            # Clear the current default first so uniq_default_item_unit holds throughout.
+            self.filter(item=item, is_default=True).update(is_default=False)
+            self.filter(item=item).exclude(code__in=[unit.code for unit in units]).update(
+                is_deleted=True, deleted_at=now, updated_at=now
+            )
+            return ItemUnit.all_objects.bulk_create(
+                units,
+                update_conflicts=True,
+                unique_fields=['item', 'code'],
+                update_fields=self.UPSERT_FIELDS
+            )
+
+
 class ItemUnit(AuditableModel):
     """Multiple units of measure for item variants."""
     item = models.ForeignKey(
@@ -644,6 +864,8 @@ class ItemUnit(AuditableModel):
         verbose_name=_("Sales Unit")
     )
 
+    objects = ItemUnitManager()
+
     class Meta:
         verbose_name = _("Item Unit")
         verbose_name_plural = _("Item Units")
@@ -656,6 +878,16 @@ class ItemUnit(AuditableModel):
             models.CheckConstraint(
                 check=models.Q(conversion_factor__gt=0),
                 name='positive_conversion_factor'
+            ),
+            models.UniqueConstraint(
+                fields=['item'],
+                condition=models.Q(is_default=True, is_deleted=False),
+                name='uniq_default_item_unit'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(name__regex=r'^\s*$'),
+                name='nonblank_item_unit_name',
+                violation_error_message=_('Name cannot be empty.')
             )
         ]
 
@@ -664,6 +896,29 @@ class ItemUnit(AuditableModel):
         if not self.name.strip():
             raise ValidationError({'name': _('Name cannot be empty.')})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_default = instance.__dict__.get('is_default')
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        becomes_default = (
+            self.is_default
+            and not getattr(self, '_loaded_is_default', False)
+            and (update_fields is None or 'is_default' in update_fields)
+        )
+        if not becomes_default:
+            super().save(*args, **kwargs)
+            return
+        # Only a switch to default touches the item's other units; the old default
+        # is cleared first so uniq_default_item_unit holds at every statement.
+        with transaction.atomic():
+            ItemUnit.objects.filter(item_id=self.item_id, is_default=True).exclude(pk=self.pk).update(is_default=False)
+            super().save(*args, **kwargs)
+        self._loaded_is_default = True
+
     def convert_to_base_units(self, quantity: Decimal) -> Decimal:
         return quantity * self.conversion_factor
 
@@ -720,7 +975,13 @@ class ItemBarcode(AuditableModel):
             models.Index(fields=['item', 'barcode']),
             models.Index(fields=['is_primary']),
         ]
-
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(barcode__regex=r'^\s*$'),
+                name='nonblank_item_barcode',
+                violation_error_message=_('Barcode cannot be empty.')
+            )
+        ]
 
     def clean(self):
         super().clean()
@@ -796,6 +1057,8 @@ class InventoryBalance(AuditableModel):
             models.Index(fields=['branch', 'item']),
             models.Index(fields=['expiry_date', 'batch_number']),
             models.Index(fields=['available_quantity', 'last_movement_date']),
+            models.Index(fields=['item', 'branch', 'expiry_date']),
+            models.Index(fields=['-last_movement_date']),
         ]
         constraints = [
             models.CheckConstraint(
@@ -812,32 +1075,32 @@ class InventoryBalance(AuditableModel):
             raise ValidationError({'batch_number': _('Batch number is required for items that track batches.')})
 
     def is_expired(self) -> bool:
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         if self.expiry_date:
             is_expired = self.expiry_date < timezone.now().date()
             if is_expired:
                 self.notify_expiry()
                 logger.info(f"Expired stock detected for batch {self.batch_number}", 
-                           extra={'item_id': self.item.id, 'batch_number': self.batch_number})
+                           extra={'item_id': self.item_id, 'batch_number': self.batch_number})
             return is_expired
         return False
 
     def is_near_expiry(self) -> bool:
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         if self.expiry_date:
             warning_date = timezone.now().date() + timezone.timedelta(days=self.item.expiry_warning_days)
             is_near = self.expiry_date <= warning_date
             if is_near and not self.is_expired():
                 self.notify_near_expiry()
                 logger.info(f"Near-expiry stock detected for batch {self.batch_number}", 
-                           extra={'item_id': self.item.id, 'batch_number': self.batch_number})
+                           extra={'item_id': self.item_id, 'batch_number': self.batch_number})
             return is_near
         return False
 
     def notify_expiry(self):
         """Send notification for expired stock."""
         from apps.core_apps.services.messaging_service import MessagingService
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         try:
             service = MessagingService(self.branch)
             service.send_notification(
@@ -854,15 +1117,15 @@ class InventoryBalance(AuditableModel):
                 priority='urgent'
             )
             logger.info(f"Expiry notification sent for batch {self.batch_number} of item {self.item.code}", 
-                       extra={'item_id': self.item.id, 'notification_type': 'expired_stock'})
+                       extra={'item_id': self.item_id, 'notification_type': 'expired_stock'})
         except Exception as e:
             logger.error(f"Error sending expiry notification for batch {self.batch_number}: {str(e)}", 
-                        extra={'item_id': self.item.id, 'notification_type': 'expired_stock'}, exc_info=True)
+                        extra={'item_id': self.item_id, 'notification_type': 'expired_stock'}, exc_info=True)
 
     def notify_near_expiry(self):
         """Send notification for near-expiry stock."""
         from apps.core_apps.services.messaging_service import MessagingService
-        logger = Logger(__name__, branch_id=self.branch.id)
+        logger = Logger(__name__, branch_id=self.branch_id)
         try:
             service = MessagingService(self.branch)
             service.send_notification(
@@ -880,10 +1143,10 @@ class InventoryBalance(AuditableModel):
                 priority='high'
             )
             logger.info(f"Near-expiry notification sent for batch {self.batch_number} of item {self.item.code}", 
-                       extra={'item_id': self.item.id, 'notification_type': 'near_expiry_stock'})
+                       extra={'item_id': self.item_id, 'notification_type': 'near_expiry_stock'})
         except Exception as e:
             logger.error(f"Error sending near-expiry notification for batch {self.batch_number}: {str(e)}", 
-                        extra={'item_id': self.item.id, 'notification_type': 'near_expiry_stock'}, exc_info=True)
+                        extra={'item_id': self.item_id, 'notification_type': 'near_expiry_stock'}, exc_info=True)
 
     def get_total_quantity(self) -> Decimal:
         return self.available_quantity + self.reserved_quantity
@@ -231,6 +231,10 @@ class ItemSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['slug', 'average_rating', 'review_count', 'created_at', 'updated_at']
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.with_units_and_barcodes().prefetch_related('media')
+
     def validate(self, data):
         """Validate name, base unit, and price constraints."""
         if not data.get('name', '').strip():
@@ -271,7 +275,9 @@ class ItemSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         representation['selling_price'] = instance.calculate_selling_price()
         representation['current_stock'] = instance.get_current_stock()
-        representation['is_low_stock'] = instance.is_low_stock()
+        # Annotated list rows carry the flag; is_low_stock() also sends the alert.
+        low_stock = instance.__dict__.get('low_stock')
+        representation['is_low_stock'] = instance.is_low_stock() if low_stock is None else low_stock
         representation['display_name'] = instance.get_display_name()
         return representation
 
@@ -47,7 +47,7 @@ class ItemSimilarityService:
             queryset = Item.objects.filter(
                 branch_id=self.branch_id,
                 visibility__in=['public', 'registered']
-            ).exclude(id=item.id)
+            ).exclude(id=item.id).with_current_stock()
             
             # Exclude out of stock items if requested
             if exclude_out_of_stock:
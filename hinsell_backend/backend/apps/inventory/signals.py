@@ -2,6 +2,7 @@ import logging
 from django.db.models.signals import post_save,post_delete
 from django.dispatch import receiver
 from apps.inventory.models import Item, InventoryBalance,ItemGroup, ItemUnit, ItemBarcode
+from apps.core_apps.indexing import queue_reindex
 # from apps.inventory.tasks import check_item_stock, check_inventory_balance, update_algolia_index, delete_algolia_index
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,18 @@ def handle_inventory_balance_save(sender, instance, created, **kwargs):
     except Exception as e:
         logger.error(f"Error handling inventory balance save: {str(e)}", exc_info=True)
 
+@receiver(post_save, sender=ItemGroup)
+@receiver(post_save, sender=Item)
+@receiver(post_save, sender=ItemUnit)
+@receiver(post_save, sender=ItemBarcode)
+@receiver(post_delete, sender=ItemGroup)
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=ItemUnit)
+@receiver(post_delete, sender=ItemBarcode)
+def handle_indexed_model_change(sender, instance, using, **kwargs):
+    """Sync the record with Algolia in the request's bulk batch once the transaction commits."""
+    queue_reindex(instance, using)
+
 # @receiver(post_save, sender=ItemGroup)
 # def handle_item_group_save(sender, instance, **kwargs):
 #     update_algolia_index.delay('inventory', 'ItemGroup', str(instance.pk))
@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from apps.core_apps.general import BaseViewSet
 from apps.core_apps.permissions import HasRolePermission
 from apps.inventory.services.similarity_service import ItemSimilarityService
+from apps.inventory.filters import ItemFilter
 from apps.inventory.models import StoreGroup, ItemGroup, Item, ItemUnit, ItemBarcode, InventoryBalance
 from apps.inventory.serializers import (
     StoreGroupSerializer, ItemGroupSerializer, ItemSerializer,
@@ -55,14 +56,11 @@ class ItemGroupViewSet(BaseViewSet):
 
 class ItemViewSet(BaseViewSet):
     """ViewSet for Item model."""
-    queryset = Item.objects.all()
+    queryset = Item.objects.with_low_stock_flag()
     serializer_class = ItemSerializer
     logger_name = 'inventory.item'
     
-    filterset_fields = [
-        'branch', 'item_group', 'code', 'item_type', 'is_featured', 'visibility',
-        'track_expiry', 'track_batches'
-    ]
+    filterset_class = ItemFilter
     search_fields = [
         'code', 'name', 'slug', 'manufacturer', 'brand',
         'description', 'short_description', 'tags'
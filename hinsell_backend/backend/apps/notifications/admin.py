@@ -1,10 +1,63 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
+from apps.authentication.models import AuditLog
 from .models import NotificationTemplate, Notification, InternalMessage, UserNote
 
 
+class SoftDeleteAdminMixin:
+    """Show superusers soft-deleted rows too, keeping the admin's list_select_related joins."""
+
+    def get_queryset(self, request):
+        manager = self.model.objects
+        qs = manager.all_with_deleted() if request.user.is_superuser else manager.get_queryset()
+        if self.list_select_related:
+            qs = qs.select_related(*self.list_select_related)
+        return qs
+
+
+class AuditLogAdminMixin:
+    """
+    Record an AuditLog entry for every admin save.
+
+    Entries are buffered on the request by save_model() and written with a
+    single bulk INSERT in save_related(), which the admin calls once per
+    add/change inside the same transaction.
+    """
+    audit_batch_size = 500
+
+    def get_audit_details(self, obj):
+        """Model-specific keys merged into the audit entry's details."""
+        return {}
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        creator = request.user if obj.created_by_id == request.user.pk else obj.created_by
+        if not hasattr(request, '_audit_logs'):
+            request._audit_logs = []
+        request._audit_logs.append(AuditLog(
+            branch_id=obj.branch_id,
+            user=creator,
+            action_type=AuditLog.ActionType.DATA_MODIFICATION,
+            username=creator.username if creator else None,
+            details={
+                'changed_by': request.user.username,
+                **self.get_audit_details(obj),
+                'action': 'update' if change else 'create'
+            },
+            created_by=request.user,
+            updated_by=request.user,
+        ))
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        audit_logs = getattr(request, '_audit_logs', None)
+        if audit_logs:
+            AuditLog.objects.bulk_create(audit_logs, batch_size=self.audit_batch_size)
+            audit_logs.clear()
+
+
 @admin.register(NotificationTemplate)
-class NotificationTemplateAdmin(admin.ModelAdmin):
+class NotificationTemplateAdmin(SoftDeleteAdminMixin, AuditLogAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for the NotificationTemplate model.
     """
@@ -45,33 +98,15 @@ class NotificationTemplateAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 25
+    list_select_related = ('branch__company',)
 
-    def get_queryset(self, request):
-        """Allow superusers to see all notification templates, including soft-deleted ones."""
-        qs = self.model.objects.get_queryset()
-        if request.user.is_superuser:
-            return self.model.objects.all_with_deleted()
-        return qs
-
-    def save_model(self, request, obj, form, change):
-        """Log notification template creation or update in audit log."""
-        from apps.authentication.models import AuditLog
-        super().save_model(request, obj, form, change)
-        AuditLog.objects.create(
-            branch=obj.branch,
-            user=obj.created_by,
-            action_type=AuditLog.ActionType.DATA_MODIFICATION,
-            username=obj.created_by.username if obj.created_by else None,
-            details={
-                'changed_by': request.user.username,
-                'template_code': obj.code,
-                'action': 'update' if change else 'create'
-            }
-        )
+    def get_audit_details(self, obj):
+        """Identify the notification template in its audit log entry."""
+        return {'template_code': obj.code}
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(SoftDeleteAdminMixin, AuditLogAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for the Notification model.
     """
@@ -129,6 +164,7 @@ class NotificationAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 25
+    list_select_related = ('recipient', 'branch__company')
 
     def recipient_display(self, obj):
         """Display recipient name or contact info."""
@@ -137,29 +173,9 @@ class NotificationAdmin(admin.ModelAdmin):
         )
     recipient_display.short_description = _('Recipient')
 
-    def get_queryset(self, request):
-        """Allow superusers to see all notifications, including soft-deleted ones."""
-        qs = self.model.objects.get_queryset()
-        if request.user.is_superuser:
-            # Use all_with_deleted for superusers
-            return self.model.objects.all_with_deleted()
-        return qs
-
-    def save_model(self, request, obj, form, change):
-        """Log notification creation or update in audit log."""
-        from apps.authentication.models import AuditLog
-        super().save_model(request, obj, form, change)
-        AuditLog.objects.create(
-            branch=obj.branch,
-            user=obj.created_by,
-            action_type=AuditLog.ActionType.DATA_MODIFICATION,
-            username=obj.created_by.username if obj.created_by else None,
-            details={
-                'changed_by': request.user.username,
-                'notification_type': obj.notification_type,
-                'action': 'update' if change else 'create'
-            }
-        )
+    def get_audit_details(self, obj):
+        """Identify the notification in its audit log entry."""
+        return {'notification_type': obj.notification_type}
 
     def has_add_permission(self, request):
         """Prevent manual creation of notifications."""
@@ -171,7 +187,7 @@ class NotificationAdmin(admin.ModelAdmin):
 
 
 @admin.register(InternalMessage)
-class InternalMessageAdmin(admin.ModelAdmin):
+class InternalMessageAdmin(SoftDeleteAdminMixin, AuditLogAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for the InternalMessage model.
     """
@@ -214,34 +230,15 @@ class InternalMessageAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 25
+    list_select_related = ('sender', 'recipient', 'branch__company')
 
-    def get_queryset(self, request):
-        """Allow superusers to see all messages, including soft-deleted ones."""
-        qs = self.model.objects.get_queryset()
-        if request.user.is_superuser:
-            # Use all_with_deleted for superusers
-            return self.model.objects.all_with_deleted()
-        return qs
-
-    def save_model(self, request, obj, form, change):
-        """Log message creation or update in audit log."""
-        from apps.authentication.models import AuditLog
-        super().save_model(request, obj, form, change)
-        AuditLog.objects.create(
-            branch=obj.branch,
-            user=obj.created_by,
-            action_type=AuditLog.ActionType.DATA_MODIFICATION,
-            username=obj.created_by.username if obj.created_by else None,
-            details={
-                'changed_by': request.user.username,
-                'message_code': obj.code,
-                'action': 'update' if change else 'create'
-            }
-        )
+    def get_audit_details(self, obj):
+        """Identify the message in its audit log entry."""
+        return {'message_code': obj.code}
 
 
 @admin.register(UserNote)
-class UserNoteAdmin(admin.ModelAdmin):
+class UserNoteAdmin(SoftDeleteAdminMixin, AuditLogAdminMixin, admin.ModelAdmin):
     """
     Admin configuration for the UserNote model.
     """
@@ -281,27 +278,8 @@ class UserNoteAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 25
+    list_select_related = ('user', 'branch__company')
 
-    def get_queryset(self, request):
-        """Allow superusers to see all user notes, including soft-deleted ones."""
-        qs = self.model.objects.get_queryset()
-        if request.user.is_superuser:
-            # Use all_with_deleted for superusers
-            return self.model.objects.all_with_deleted()
-        return qs
-
-    def save_model(self, request, obj, form, change):
-        """Log user note creation or update in audit log."""
-        from apps.authentication.models import AuditLog
-        super().save_model(request, obj, form, change)
-        AuditLog.objects.create(
-            branch=obj.branch,
-            user=obj.created_by,
-            action_type=AuditLog.ActionType.DATA_MODIFICATION,
-            username=obj.created_by.username if obj.created_by else None,
-            details={
-                'changed_by': request.user.username,
-                'note_code': obj.code,
-                'action': 'update' if change else 'create'
-            }
-        )
\ No newline at end of file
+    def get_audit_details(self, obj):
+        """Identify the user note in its audit log entry."""
+        return {'note_code': obj.code}
\ No newline at end of file
@@ -89,6 +89,7 @@ class NotificationTemplate(AuditableModel):
         indexes = [
             models.Index(fields=['branch', 'notification_type', 'channel']),
             models.Index(fields=['code']),
+            models.Index(fields=['-created_at']),
         ]
 
     def clean(self):
@@ -273,6 +274,7 @@ class Notification(AuditableModel):
             models.Index(fields=['branch', 'recipient', 'status']),
             models.Index(fields=['channel', 'notification_type', 'priority']),
             models.Index(fields=['scheduled_at', 'recurrence']),
+            models.Index(fields=['-created_at']),
         ]
 
     def clean(self):
@@ -476,6 +478,7 @@ class InternalMessage(AuditableModel):
         indexes = [
             models.Index(fields=['branch', 'sender', 'recipient']),
             models.Index(fields=['is_read', 'priority']),
+            models.Index(fields=['-created_at']),
         ]
 
     def clean(self):
@@ -555,6 +558,7 @@ class UserNote(AuditableModel):
         indexes = [
             models.Index(fields=['user', 'branch']),
             models.Index(fields=['reminder_date', 'is_reminder_sent']),
+            models.Index(fields=['-created_at']),
         ]
 
     def clean(self):
@@ -53,9 +53,6 @@ class LicenseTypeAdmin(admin.ModelAdmin):
     restore_selected.short_description = _("Restore selected license types")
 
     def save_model(self, request, obj, form, change):
-        if not change:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         AuditService.create_audit_log(
             branch=None,
@@ -114,10 +111,8 @@ class LicenseAdmin(admin.ModelAdmin):
 
     def save_model(self, request, obj, form, change):
         if not change:
-            obj.created_by = request.user
             obj.license_key = obj.generate_license_key()
             obj.license_hash = obj.generate_license_hash(obj.license_key)
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         obj.validate_and_update()
         AuditService.create_audit_log(
@@ -169,9 +164,6 @@ class CompanyAdmin(admin.ModelAdmin):
     restore_selected.short_description = _("Restore selected companies")
 
     def save_model(self, request, obj, form, change):
-        if not change:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         AuditService.create_audit_log(
             branch=None,
@@ -230,9 +222,6 @@ class BranchAdmin(admin.ModelAdmin):
     restore_selected.short_description = _("Restore selected branches")
 
     def save_model(self, request, obj, form, change):
-        if not change:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         AuditService.create_audit_log(
             branch=obj,
@@ -296,9 +285,6 @@ class SystemSettingsAdmin(admin.ModelAdmin):
     restore_selected.short_description = _("Restore selected system settings")
 
     def save_model(self, request, obj, form, change):
-        if not change:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         AuditService.create_audit_log(
             branch=obj.branch,
@@ -357,9 +343,6 @@ class KeyboardShortcutsAdmin(admin.ModelAdmin):
     restore_selected.short_description = _("Restore selected keyboard shortcuts")
 
     def save_model(self, request, obj, form, change):
-        if not change:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         AuditService.create_audit_log(
             branch=obj.branch,
@@ -180,7 +180,9 @@ class Media(AuditableModel):
     def save(self, *args, **kwargs):
         """Set media_type, file_size, image_dimensions, optimize images (compress/convert to WebP), before saving."""
         self.full_clean()  # Validates and sets media_type based on original file
-        if self.file and self.media_type == 'image':
+        # A committed file is already stored (and optimized); only fresh uploads go through PIL.
+        new_upload = bool(self.file) and not self.file._committed
+        if new_upload and self.media_type == 'image':
             try:
                 img = Image.open(self.file)
                 img = self._handle_exif_orientation(img)
@@ -217,7 +219,7 @@ class Media(AuditableModel):
                 self.file_size = self.file.size
                 self.image_dimensions = None
         else:
-            if self.file:
+            if self.file and (new_upload or self.file_size is None):
                 self.file_size = self.file.size
 
         super().save(*args, **kwargs)
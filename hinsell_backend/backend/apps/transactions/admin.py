@@ -28,9 +28,6 @@ class TransactionTypeAdmin(admin.ModelAdmin):
     )
 
     def save_model(self, request, obj, form, change):
-        if not obj.pk:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         logger.info(
             f"{'Updated' if change else 'Created'} TransactionType {obj.code}",
@@ -74,52 +71,46 @@ class TransactionHeaderAdmin(admin.ModelAdmin):
     actions = ['approve_transactions', 'post_transactions', 'reverse_transactions']
 
     def approve_transactions(self, request, queryset):
-        for transaction in queryset:
-            if transaction.status == TransactionHeader.Status.PENDING:
-                try:
-                    transaction.approve(request.user)
-                    self.message_user(request, f"Transaction {transaction.code} approved.")
-                except Exception as e:
-                    self.message_user(request, f"Error approving {transaction.code}: {str(e)}", level='error')
-                    logger.error(
-                        f"Error approving transaction {transaction.code}: {str(e)}",
-                        extra={'user_id': request.user.id, 'object_id': transaction.id}
-                    )
+        for transaction in queryset.filter(status=TransactionHeader.Status.PENDING).iterator(chunk_size=2000):
+            try:
+                transaction.approve(request.user)
+                self.message_user(request, f"Transaction {transaction.code} approved.")
+            except Exception as e:
+                self.message_user(request, f"Error approving {transaction.code}: {str(e)}", level='error')
+                logger.error(
+                    f"Error approving transaction {transaction.code}: {str(e)}",
+                    extra={'user_id': request.user.id, 'object_id': transaction.id}
+                )
     approve_transactions.short_description = _("Approve selected transactions")
 
     def post_transactions(self, request, queryset):
-        for transaction in queryset:
-            if transaction.status == TransactionHeader.Status.APPROVED:
-                try:
-                    transaction.post(request.user)
-                    self.message_user(request, f"Transaction {transaction.code} posted.")
-                except Exception as e:
-                    self.message_user(request, f"Error posting {transaction.code}: {str(e)}", level='error')
-                    logger.error(
-                        f"Error posting transaction {transaction.code}: {str(e)}",
-                        extra={'user_id': request.user.id, 'object_id': transaction.id}
-                    )
+        for transaction in queryset.filter(status=TransactionHeader.Status.APPROVED).iterator(chunk_size=2000):
+            try:
+                transaction.post(request.user)
+                self.message_user(request, f"Transaction {transaction.code} posted.")
+            except Exception as e:
+                self.message_user(request, f"Error posting {transaction.code}: {str(e)}", level='error')
+                logger.error(
+                    f"Error posting transaction {transaction.code}: {str(e)}",
+                    extra={'user_id': request.user.id, 'object_id': transaction.id}
+                )
     post_transactions.short_description = _("Post selected transactions")
 
     def reverse_transactions(self, request, queryset):
-        for transaction in queryset:
-            if transaction.status == TransactionHeader.Status.POSTED:
-                try:
-                    reason = f"Reversed via admin by {request.user.username}"
-                    transaction.reverse(request.user, reason)
-                    self.message_user(request, f"Transaction {transaction.code} reversed.")
-                except Exception as e:
-                    self.message_user(request, f"Error reversing {transaction.code}: {str(e)}", level='error')
-                    logger.error(
-                        f"Error reversing transaction {transaction.code}: {str(e)}",
-                        extra={'user_id': request.user.id, 'object_id': transaction.id}
-                    )
+        for transaction in queryset.filter(status=TransactionHeader.Status.POSTED).iterator(chunk_size=2000):
+            try:
+                reason = f"Reversed via admin by {request.user.username}"
+                transaction.reverse(request.user, reason)
+                self.message_user(request, f"Transaction {transaction.code} reversed.")
+            except Exception as e:
+                self.message_user(request, f"Error reversing {transaction.code}: {str(e)}", level='error')
+                logger.error(
+                    f"Error reversing transaction {transaction.code}: {str(e)}",
+                    extra={'user_id': request.user.id, 'object_id': transaction.id}
+                )
     reverse_transactions.short_description = _("Reverse selected transactions")
 
     def save_model(self, request, obj, form, change):
-        if not obj.pk:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         logger.info(
             f"{'Updated' if change else 'Created'} TransactionHeader {obj.code}",
@@ -155,9 +146,6 @@ class TransactionDetailAdmin(admin.ModelAdmin):
     )
 
     def save_model(self, request, obj, form, change):
-        if not obj.pk:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         logger.info(
             f"{'Updated' if change else 'Created'} TransactionDetail for header {obj.header.code}",
@@ -193,9 +181,6 @@ class LedgerEntryAdmin(admin.ModelAdmin):
     )
 
     def save_model(self, request, obj, form, change):
-        if not obj.pk:
-            obj.created_by = request.user
-        obj.updated_by = request.user
         super().save_model(request, obj, form, change)
         logger.info(
             f"{'Updated' if change else 'Created'} LedgerEntry {obj.code}",
@@ -6,6 +6,10 @@ app = Celery('core')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+from core.celery_schedules import HINSELL_SCHEDULES  # noqa: E402  (needs DJANGO_SETTINGS_MODULE)
+
+app.conf.beat_schedule = {**HINSELL_SCHEDULES}
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
\ No newline at end of file
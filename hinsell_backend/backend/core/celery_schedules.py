@@ -31,6 +31,16 @@ AR_SCHEDULES = {
     
 }
 
+HINSELL_SCHEDULES = {
+    'flush-campaign-counters': {
+        'task': 'apps.hinsell.tasks.flush_campaign_counters',
+        'schedule': crontab(minute='*'),
+        'options': {
+            'expires': 50,
+        }
+    },
+}
+
 if getattr(settings, 'AR_CUSTOM_SCHEDULE', False):
     custom_hour = getattr(settings, 'AR_NOTIFICATION_HOUR', 0)
     custom_minute = getattr(settings, 'AR_NOTIFICATION_MINUTE', 0)
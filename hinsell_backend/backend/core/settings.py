@@ -117,6 +117,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core_apps.middleware.CurrentUserMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.authentication.middleware.UserActivityMiddleware',
@@ -367,7 +368,8 @@ CACHES = {
 
 ALGOLIA = {
   'APPLICATION_ID': env('APPLICATION_ID', default='5E6XO5ZT4W'),
-  'API_KEY': env('API_KEY', default='0feaf0462c02fc00fd672102a17e5d15')
+  'API_KEY': env('API_KEY', default='0feaf0462c02fc00fd672102a17e5d15'),
+  'AUTO_INDEXING': env.bool('ALGOLIA_AUTO_INDEXING', default=False),
 }
 
 # ======================